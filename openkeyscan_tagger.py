@@ -6,31 +6,46 @@ Runs as a long-running process, writing and reading key metadata to/from audio f
 Communicates via line-delimited JSON (NDJSON) protocol.
 
 Protocol:
-  Write Request:  {"id": "uuid", "path": "/absolute/path/file.mp3", "key": "9A"}
+  Write Request:  {"id": "uuid", "path": "/absolute/path/file.mp3", "key": "9A", "legacy": false}
   Read Request:    {"id": "uuid", "path": "/absolute/path/file.mp3"}
+  Batch Request:   {"id": "uuid", "batch": [{"path": "/absolute/path/file.mp3", "key": "9A"}, ...]}
   Success:         {"id": "uuid", "status": "success", "key": "9A", "filename": "file.mp3", "format": "mp3", "artist": "Artist Name", "title": "Track Title", "album": "Album Name", "albumArtPath": "/tmp/openkeyscan-art-uuid.jpg"}
   Error:           {"id": "uuid", "status": "error", "error": "Error message", "filename": "file.mp3"}
+  Batch:           {"id": "uuid", "status": "batch", "results": [<success or error response per entry>, ...]}
   Ready:           {"type": "ready"}
   Heartbeat:       {"type": "heartbeat"}
 
 Note: albumArtPath, artist, title, and album are optional and only included if found in the file.
 
 Note: If "key" field is missing or empty, the request is treated as a read operation.
+
+Note: "legacy" is optional. When true, FLAC/OGG/MP4 writes also set the legacy KEY
+field next to initialkey; by default KEY is removed.
 """
 
 import sys
 import os
-import json
+import io
+import errno
+import stat
+import shutil
 import threading
 import time
+import queue
+import multiprocessing
 import tempfile
 import uuid
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import orjson
 
 # Import mutagen for audio tagging
-from mutagen import File
-from mutagen.id3 import ID3, TKEY, APIC, ID3NoHeaderError
+from mutagen import File, PaddingInfo
+from mutagen.id3 import ID3, TKEY, APIC, ID3NoHeaderError, Frames as ID3_FRAMES
 from mutagen.mp4 import MP4
 from mutagen.flac import FLAC
 from mutagen.oggvorbis import OggVorbis
@@ -38,18 +53,32 @@ from mutagen.aiff import AIFF
 from mutagen.wave import WAVE
 
 # ============================================================================
-# CRITICAL: UTF-8 Encoding Configuration for Windows/PyInstaller
+# CRITICAL: UTF-8 Encoding on Windows/PyInstaller
 # ============================================================================
-# On Windows, Python defaults to cp1252 encoding for stdio, but Node.js
-# child_process sends UTF-8. This mismatch causes UnicodeDecodeError when
-# reading JSON with non-ASCII characters (e.g., file paths with accents).
+# On Windows, Python defaults to cp1252 encoding for text-mode stdio, but
+# Node.js child_process sends UTF-8. Decoding JSON with non-ASCII characters
+# (e.g., file paths with accents) through the text layer fails there.
 #
-# Solution: Reconfigure stdin/stdout to UTF-8 at runtime at MODULE LEVEL.
-# Must be done BEFORE any sys.stdin.readline() calls and at module level
-# (not inside a function) so it executes during import.
+# Solution: never touch the text layer. Requests are read as raw bytes from
+# stdin and handed to orjson, which decodes UTF-8 itself; responses are
+# written as orjson's UTF-8 bytes straight to stdout.
 # ============================================================================
-sys.stdin.reconfigure(encoding="utf-8")
-sys.stdout.reconfigure(encoding="utf-8")
+STDIN_BUFFER_SIZE = 1 << 20
+STDOUT_BUFFER_SIZE = 65536
+
+# Buffer size used when opening audio files for mutagen
+IO_BUFFER_SIZE = 65536
+
+# Parsed MP4/FLAC/OGG objects shared by the steps of one request (reading the
+# key, then extracting album art from the same file); None outside a request
+_audio_cache = None
+
+# Requests each worker may have queued or in progress before the server
+# stops reading stdin
+MAX_PENDING_PER_WORKER = 4
+
+# Seconds between heartbeat messages
+HEARTBEAT_INTERVAL = 30
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and PyInstaller."""
@@ -60,15 +89,92 @@ def get_resource_path(relative_path):
     return base_path / relative_path
 
 
-def sync_file(file_path):
-    """Force file to be written to disk."""
+def _open_buffered(file_path, mode='rb'):
+    """
+    Open an audio file for mutagen with a large I/O buffer.
+
+    Mutagen's own open() uses the default block-size heuristic, which on
+    network filesystems (NFS/SMB) collapses to many tiny reads. Handing it a
+    pre-opened file object with an explicit buffer size avoids that.
+
+    Args:
+        file_path (Path): Path to audio file
+        mode (str): 'rb' for reads, 'r+b' for in-place writes
+
+    Returns:
+        file object: Buffered binary file object (use as a context manager)
+    """
+    return open(file_path, mode, buffering=IO_BUFFER_SIZE)
+
+
+def _save_to(audio, f, **kwargs):
+    """Save mutagen tags back through an already-open file object."""
+    # Mutagen reads the container header from the current position, which
+    # is wherever loading left the handle
+    f.seek(0)
+    audio.save(f, **kwargs)
+
+
+@contextmanager
+def _request_audio_cache():
+    """
+    Let the mutagen parses made inside the block be reused within it.
+
+    Nothing is kept across requests: another worker or program may rewrite
+    the file in between without changing its size or (on coarse-timestamp
+    filesystems such as FAT32, exFAT, HFS+ or SMB) its mtime, so a stat
+    check cannot tell a cached parse is stale.
+    """
+    global _audio_cache
+    _audio_cache = {}
+    try:
+        yield
+    finally:
+        _audio_cache = None
+
+
+def _load_audio(cls, f, for_write=False):
+    """
+    Parse an audio file with mutagen, reusing the object parsed earlier in
+    the same request (see _request_audio_cache) if there is one.
+
+    Args:
+        cls: Mutagen file type (MP4, FLAC, OggVorbis)
+        f: Binary file object opened on the file's path
+        for_write (bool): The caller is about to modify the object and the
+            file; take it out of the cache instead of keeping it
+
+    Returns:
+        Mutagen audio object
+    """
+    if _audio_cache is None:
+        return cls(f)
     try:
-        # Open and sync the file to ensure it's written
-        fd = os.open(file_path, os.O_RDONLY)
-        os.fsync(fd)
-        os.close(fd)
-    except Exception:
-        pass  # Best effort, don't fail if sync doesn't work
+        cache_key = (os.fspath(f.name), cls)
+    except (AttributeError, TypeError):
+        # In-memory stream: no path to share a parse under
+        return cls(f)
+
+    audio = _audio_cache.pop(cache_key, None)
+    if audio is None:
+        audio = cls(f)
+    if not for_write:
+        _audio_cache[cache_key] = audio
+    return audio
+
+
+# Lowercased tag names seen so far. Files use a handful of distinct names,
+# and a dict hit is cheaper than str.lower() on long freeform names
+_lowered_names = {}
+_LOWERED_NAMES_MAX = 4096
+
+
+def _remember_lowered(name):
+    """Lowercase a tag name, caching it for the case-insensitive scans."""
+    lowered = name.lower()
+    if len(_lowered_names) < _LOWERED_NAMES_MAX:
+        _lowered_names[name] = lowered
+    return lowered
 
 
 def get_vorbis_field_case_insensitive(audio, field_name):
@@ -82,12 +188,43 @@ def get_vorbis_field_case_insensitive(audio, field_name):
     Returns:
         Field value if found, None otherwise
     """
-    field_lower = field_name.lower()
-    for key in audio.keys():
-        if key.lower() == field_lower:
-            value_list = audio[key]
-            return value_list[0] if value_list else None
-    return None
+    # Mutagen's Vorbis comment lookup already folds case in a single pass
+    # over the comments, so there is no need to scan keys() first
+    value_list = audio.get(field_name)
+    return value_list[0] if value_list else None
+
+
+def get_vorbis_field_first_of(audio, names):
+    """
+    Get the value of the first present Vorbis comment field out of several
+    candidates, in a single case-insensitive pass over the comments.
+
+    Args:
+        audio: Mutagen audio object with Vorbis comments
+        names: Field names in priority order (case-insensitive)
+
+    Returns:
+        Value of the highest-priority field found, None otherwise
+    """
+    if not audio.tags:
+        return None
+
+    wanted = [name.lower() for name in names]
+    best_value = None
+    best_rank = len(wanted)
+    for key, value in audio.tags:
+        if not value:
+            continue
+        lowered = _lowered_names.get(key)
+        if lowered is None:
+            lowered = _remember_lowered(key)
+        if lowered in wanted:
+            rank = wanted.index(lowered)
+            if rank < best_rank:
+                best_value, best_rank = value, rank
+                if rank == 0:
+                    break
+    return best_value
 
 
 def get_mp4_field_case_insensitive(audio, field_name):
@@ -99,30 +236,69 @@ def get_mp4_field_case_insensitive(audio, field_name):
         field_name: Field name to search for (case-insensitive)
 
     Returns:
-        Field value if found, None otherwise
+        Field value as str if found, None otherwise
+    """
+    value = get_mp4_field_first_of(audio, (field_name,))
+    if value is None:
+        return None
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+def get_mp4_field_first_of(audio, names):
+    """
+    Get the value of the first present MP4 freeform tag out of several
+    candidates, in a single case-insensitive pass over the keys.
+
+    Args:
+        audio: Mutagen MP4 audio object
+        names: Full freeform tag names in priority order (case-insensitive)
+
+    Returns:
+        Raw first value (usually MP4FreeForm bytes) of the highest-priority
+        tag found, None otherwise. Decoding is left to the caller.
     """
-    field_lower = field_name.lower()
-    for key in audio.keys():
-        if key.lower() == field_lower:
-            value_list = audio[key]
-            if value_list:
-                value = value_list[0]
-                return value.decode('utf-8') if isinstance(value, bytes) else str(value)
-    return None
+    # Exact-case hit on the preferred name needs no scan at all
+    value_list = audio.get(names[0])
+    if not value_list:
+        wanted = [name.lower() for name in names]
+        best_rank = len(wanted)
+        for key, values in audio.items():
+            if not values:
+                continue
+            lowered = _lowered_names.get(key)
+            if lowered is None:
+                lowered = _remember_lowered(key)
+            if lowered in wanted:
+                rank = wanted.index(lowered)
+                if rank < best_rank:
+                    value_list, best_rank = values, rank
+                    if rank == 0:
+                        break
+        if not value_list:
+            return None
+
+    # Objects not yet saved may hold a single bare value, which mutagen
+    # accepts in place of a list
+    if isinstance(value_list, bytes):
+        return value_list
+    return value_list[0]
 
 
-def extract_album_art(file_path):
+def extract_album_art(file_path, file_ext=None):
     """
     Extract album art from an audio file and save to a temporary file.
 
     Args:
-        file_path (Path): Path to audio file
+        file_path (str or Path): Path to audio file
+        file_ext (str): Lowercase extension including the dot, computed from
+            file_path if not given
 
     Returns:
         str or None: Path to temporary file containing album art, or None if not found
     """
     try:
-        file_ext = file_path.suffix.lower()
+        if file_ext is None:
+            file_ext = os.path.splitext(file_path)[1].lower()
         image_data = None
         mime_type = None
 
@@ -141,7 +317,8 @@ def extract_album_art(file_path):
 
         # MP4/M4A/ALAC files - read covr atom
         elif file_ext in ['.mp4', '.m4a', '.alac']:
-            audio = MP4(file_path)
+            with _open_buffered(file_path) as f:
+                audio = _load_audio(MP4, f)
             if 'covr' in audio and len(audio['covr']) > 0:
                 cover = audio['covr'][0]
                 image_data = bytes(cover)
@@ -156,7 +333,8 @@ def extract_album_art(file_path):
 
         # FLAC files - read Picture block
         elif file_ext == '.flac':
-            audio = FLAC(file_path)
+            with _open_buffered(file_path) as f:
+                audio = _load_audio(FLAC, f)
             if audio.pictures and len(audio.pictures) > 0:
                 picture = audio.pictures[0]
                 image_data = picture.data
@@ -164,7 +342,8 @@ def extract_album_art(file_path):
 
         # OGG Vorbis files - read embedded pictures (Vorbis comments)
         elif file_ext == '.ogg':
-            audio = OggVorbis(file_path)
+            with _open_buffered(file_path) as f:
+                audio = _load_audio(OggVorbis, f)
             # OGG can have METADATA_BLOCK_PICTURE in Vorbis comments
             # This is base64-encoded FLAC picture block
             if 'metadata_block_picture' in audio:
@@ -229,7 +408,424 @@ def extract_album_art(file_path):
         return None
 
 
-def read_key_from_file(file_path):
+# ID3v2 text frames read by the fast path, in _read_id3_frames order
+_ID3_TEXT_FRAMES = (b'TKEY', b'TPE1', b'TIT2', b'TALB')
+
+# Text encoding byte -> codec
+_ID3_TEXT_ENCODINGS = ('latin-1', 'utf-16', 'utf-16-be', 'utf-8')
+
+# Frame flags the fast path does not handle (compression, encryption,
+# unsynchronisation, data length indicator, grouping)
+_ID3_UNHANDLED_FRAME_FLAGS = {3: 0x00e0, 4: 0x004f}
+
+
+# Frame IDs mutagen knows, which it counts when guessing v2.4 frame size encoding
+_ID3_KNOWN_FRAME_IDS = frozenset(frame_id.encode('ascii') for frame_id in ID3_FRAMES)
+
+_ID3_EMPTY_FRAME_HEADER = bytes(10)
+
+
+def _id3v24_uses_plain_sizes(data):
+    """
+    Tell whether mutagen reads the frame sizes of an ID3v2.4 tag as plain ints.
+
+    Old iTunes versions wrote v2.4 frame sizes as plain 32-bit ints instead of
+    synchsafe ints. Mutagen walks the frames both ways and keeps the reading
+    that finds more frames it knows (determine_bpi in mutagen.id3._tags);
+    this makes the same decision so the fast path agrees with mutagen.
+
+    Args:
+        data (bytes): Tag body after the 10-byte tag header
+
+    Returns:
+        bool: True if mutagen reads the frame sizes as plain ints
+    """
+    def walk(synchsafe):
+        # (known frames found, how far the walk ended past the end of data)
+        pos = found = 0
+        while pos < len(data) - 10:
+            header = data[pos:pos + 10]
+            if header == _ID3_EMPTY_FRAME_HEADER:
+                return found, -((len(data) - pos) % 10)
+            size = int.from_bytes(header[4:8], 'big')
+            if synchsafe:
+                size = (((size & 0x7f000000) >> 3) | ((size & 0x7f0000) >> 2)
+                        | ((size & 0x7f00) >> 1) | (size & 0x7f))
+            pos += 10 + size
+            if header[:4] in _ID3_KNOWN_FRAME_IDS:
+                found += 1
+        return found, pos - len(data)
+
+    synchsafe_found, synchsafe_past = walk(True)
+    int_found, int_past = walk(False)
+    return int_found > synchsafe_found or (
+        int_found == synchsafe_found and synchsafe_past >= 1 and int_past <= 1)
+
+
+def _decode_id3_text(body):
+    """
+    Decode the first string of an ID3v2 text frame.
+
+    Args:
+        body (bytes): Frame payload (encoding byte followed by the text)
+
+    Returns:
+        str or None: First string in the frame, None if the frame is empty
+
+    Raises:
+        ValueError: If the encoding byte is invalid or the text doesn't decode
+    """
+    encoding = body[0]
+    if encoding >= len(_ID3_TEXT_ENCODINGS):
+        raise ValueError(f"Invalid ID3 text encoding: {encoding}")
+    text = body[1:]
+    if not text:
+        return None
+
+    # Strings are NUL-terminated; UTF-16 terminators are two bytes on a
+    # code unit boundary
+    if encoding in (0, 3):
+        end = text.find(b'\x00')
+    else:
+        end = text.find(b'\x00\x00')
+        while end != -1 and end % 2:
+            end = text.find(b'\x00\x00', end + 1)
+    if end != -1:
+        text = text[:end]
+    return text.decode(_ID3_TEXT_ENCODINGS[encoding])
+
+
+def _scan_id3_text_frames(f):
+    """
+    Read key and metadata from an ID3v2 tag without building mutagen frames.
+
+    Reads the tag header at the current position of f, then the tag body in
+    a single read, and walks the frame headers picking out TKEY, TPE1, TIT2
+    and TALB. Only the common ID3v2.3/2.4 layout is handled; anything else
+    (ID3v2.2, unsynchronisation, extended headers, compressed or encrypted
+    frames, iTunes-style non-synchsafe v2.4 frame sizes, frames after what
+    looks like padding, ID3v1 fallback values) returns None so the caller
+    can hand the file to mutagen.
+
+    Args:
+        f: Binary file object positioned at the start of the ID3v2 header
+
+    Returns:
+        tuple or None: (key_value, artist, title, album), each str or None,
+            or None if the tag needs mutagen
+    """
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return None
+    version = header[3]
+    if version not in (3, 4):
+        return None
+    # Unsynchronisation, extended header and unknown flags
+    if header[5] & (0xdf if version == 3 else 0xcf):
+        return None
+    if (header[6] | header[7] | header[8] | header[9]) & 0x80:
+        return None
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    data = f.read(size)
+    if len(data) < size:
+        return None
+
+    unhandled_flags = _ID3_UNHANDLED_FRAME_FLAGS[version]
+    found = {}
+    plain_sizes_checked = False
+    pos = 0
+    while pos + 10 <= size:
+        frame_id = data[pos:pos + 4]
+        if frame_id == b'\x00\x00\x00\x00':
+            # Padding runs to the end of the tag; anything else means the
+            # walk went wrong somewhere
+            if data.count(0, pos) != size - pos:
+                return None
+            break
+        if not (frame_id.isalnum() and frame_id.isupper()):
+            return None
+        if version == 4:
+            if (data[pos + 4] | data[pos + 5] | data[pos + 6] | data[pos + 7]) & 0x80:
+                return None
+            frame_size = ((data[pos + 4] << 21) | (data[pos + 5] << 14)
+                          | (data[pos + 6] << 7) | data[pos + 7])
+            # From 0x80 on, the synchsafe and plain int readings differ;
+            # mutagen then picks one for the whole tag
+            if frame_size >= 0x80 and not plain_sizes_checked:
+                if _id3v24_uses_plain_sizes(data):
+                    return None
+                plain_sizes_checked = True
+        else:
+            frame_size = int.from_bytes(data[pos + 4:pos + 8], 'big')
+        body_start = pos + 10
+        pos = body_start + frame_size
+        if pos > size:
+            return None
+
+        if frame_size and frame_id in _ID3_TEXT_FRAMES and frame_id not in found:
+            if int.from_bytes(data[body_start - 2:body_start], 'big') & unhandled_flags:
+                return None
+            try:
+                value = _decode_id3_text(data[body_start:pos])
+            except ValueError:
+                return None
+            # Mutagen merges repeated text frames, so an empty first frame
+            # defers to the next one
+            if value is not None:
+                found[frame_id] = value
+
+    key_value, artist, title, album = (found.get(frame_id) for frame_id in _ID3_TEXT_FRAMES)
+
+    # Mutagen fills gaps from an ID3v1 tag at the end of the file
+    if artist is None or title is None or album is None:
+        try:
+            f.seek(-131, os.SEEK_END)
+        except OSError:
+            f.seek(0)
+        if b'TAG' in f.read(131):
+            return None
+
+    return key_value, artist, title, album
+
+
+def _find_iff_id3_chunk(f, riff):
+    """
+    Locate the ID3 chunk of a WAV (RIFF) or AIFF (FORM) file.
+
+    Args:
+        f: Binary file object positioned at the start of the file
+        riff (bool): True for RIFF/WAVE, False for FORM/AIFF
+
+    Returns:
+        int or None: Data offset of the ID3 chunk, -1 if the file has none,
+            or None if the container needs mutagen
+    """
+    if riff:
+        magic, forms, byteorder = b'RIFF', (b'WAVE',), 'little'
+        info_id, id3_ids = b'fmt', (b'id3', b'ID3')
+    else:
+        magic, forms, byteorder = b'FORM', (b'AIFF', b'AIFC'), 'big'
+        info_id, id3_ids = b'COMM', (b'ID3',)
+
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != magic or header[8:12] not in forms:
+        return None
+    form_size = int.from_bytes(header[4:8], byteorder)
+    end = 8 + form_size + (form_size & 1)
+
+    have_info = False
+    id3_offset = -1
+    offset = 12
+    while offset < end:
+        f.seek(offset)
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunk_id = chunk_header[:4]
+        if not all(0x20 <= c <= 0x7e for c in chunk_id):
+            return None
+        chunk_id = chunk_id.rstrip()
+        if chunk_id == info_id:
+            have_info = True
+        elif chunk_id in id3_ids and id3_offset < 0:
+            id3_offset = offset + 8
+        if have_info and id3_offset >= 0:
+            break
+        chunk_size = int.from_bytes(chunk_header[4:8], byteorder)
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+    # Let mutagen report files without a stream info chunk
+    if not have_info:
+        return None
+    return id3_offset
+
+
+def _id3_text(tags, frame_id):
+    """
+    Get the first string of an ID3 text frame.
+
+    Args:
+        tags: Mutagen ID3 tags
+        frame_id (str): Frame ID, e.g. 'TKEY'
+
+    Returns:
+        str or None: First text value, None if the frame is missing or empty
+    """
+    frame = tags.get(frame_id)
+    text = frame.text if frame is not None else None
+    return str(text[0]) if text else None
+
+
+def _read_id3_frames(tags):
+    """
+    Read key and metadata from ID3 frames.
+
+    Args:
+        tags: Mutagen ID3 tags
+
+    Returns:
+        tuple: (key_value, artist, title, album), each str or None
+    """
+    return (_id3_text(tags, 'TKEY'), _id3_text(tags, 'TPE1'),
+            _id3_text(tags, 'TIT2'), _id3_text(tags, 'TALB'))
+
+
+def _read_vorbis_comments(audio):
+    """
+    Read key and metadata from Vorbis comments (FLAC/OGG).
+
+    Args:
+        audio: Mutagen audio object with Vorbis comments
+
+    Returns:
+        tuple: (key_value, artist, title, album), each str or None
+    """
+    # Prefer initialkey (standard) over KEY (legacy) - case insensitive
+    key_value = get_vorbis_field_first_of(audio, ('initialkey', 'KEY'))
+
+    # Read metadata from Vorbis comments
+    artist = get_vorbis_field_case_insensitive(audio, 'artist')
+    title = get_vorbis_field_case_insensitive(audio, 'title')
+    album = get_vorbis_field_case_insensitive(audio, 'album')
+
+    return key_value, artist, title, album
+
+
+def _read_id3(f):
+    """Read MP3/AAC files - ID3v2 TKEY frame and metadata."""
+    frames = _scan_id3_text_frames(f)
+    if frames is not None:
+        return frames
+
+    f.seek(0)
+    try:
+        audio = ID3(f)
+    except ID3NoHeaderError:
+        return None, None, None, None
+    return _read_id3_frames(audio)
+
+
+def _read_mp4(f):
+    """Read MP4/M4A/ALAC files - freeform tags and standard atoms."""
+    return _read_mp4_tags(_load_audio(MP4, f))
+
+
+def _read_mp4_tags(audio):
+    """
+    Read key and metadata from MP4 freeform tags and standard atoms.
+
+    Args:
+        audio: Mutagen MP4 audio object
+
+    Returns:
+        tuple: (key_value, artist, title, album), each str or None
+    """
+    # Prefer initialkey (standard) over KEY (legacy) - case insensitive
+    key_value = get_mp4_field_first_of(
+        audio, ('----:com.apple.iTunes:initialkey', '----:com.apple.iTunes:KEY'))
+    if key_value is not None:
+        key_value = key_value.decode('utf-8') if isinstance(key_value, bytes) else str(key_value)
+
+    # Read standard MP4 atoms for metadata
+    artist = None
+    title = None
+    album = None
+    if '\xa9ART' in audio and audio['\xa9ART']:
+        artist = str(audio['\xa9ART'][0])
+    if '\xa9nam' in audio and audio['\xa9nam']:
+        title = str(audio['\xa9nam'][0])
+    if '\xa9alb' in audio and audio['\xa9alb']:
+        album = str(audio['\xa9alb'][0])
+
+    return key_value, artist, title, album
+
+
+def _read_flac(f):
+    """Read FLAC files - Vorbis comments."""
+    return _read_vorbis_comments(_load_audio(FLAC, f))
+
+
+def _read_ogg(f):
+    """Read OGG Vorbis files - Vorbis comments."""
+    return _read_vorbis_comments(_load_audio(OggVorbis, f))
+
+
+def _read_aiff(f):
+    """Read AIFF/AIF files - ID3 tags."""
+    id3_offset = _find_iff_id3_chunk(f, riff=False)
+    if id3_offset is not None:
+        if id3_offset < 0:
+            return None, None, None, None
+        f.seek(id3_offset)
+        frames = _scan_id3_text_frames(f)
+        if frames is not None:
+            return frames
+
+    f.seek(0)
+    audio = AIFF(f)
+    if not audio.tags:
+        return None, None, None, None
+    return _read_id3_frames(audio.tags)
+
+
+def _read_wave(f):
+    """Read WAV files - ID3 tags."""
+    id3_offset = _find_iff_id3_chunk(f, riff=True)
+    if id3_offset is not None:
+        if id3_offset < 0:
+            return None, None, None, None
+        f.seek(id3_offset)
+        frames = _scan_id3_text_frames(f)
+        if frames is not None:
+            return frames
+
+    f.seek(0)
+    audio = WAVE(f)
+    if not audio.tags:
+        return None, None, None, None
+    return _read_id3_frames(audio.tags)
+
+
+def read_key_from_audio(audio):
+    """
+    Read key and metadata from an already-parsed mutagen object, without
+    touching the file it came from.
+
+    Args:
+        audio: Mutagen ID3, MP4, FLAC, OggVorbis, AIFF or WAVE object
+
+    Returns:
+        tuple: (key_value, artist, title, album), each str or None
+    """
+    if isinstance(audio, MP4):
+        return _read_mp4_tags(audio)
+    if isinstance(audio, (FLAC, OggVorbis)):
+        return _read_vorbis_comments(audio)
+    if isinstance(audio, ID3):
+        return _read_id3_frames(audio)
+    if isinstance(audio, (AIFF, WAVE)):
+        if not audio.tags:
+            return None, None, None, None
+        return _read_id3_frames(audio.tags)
+    raise TypeError(f"Unsupported audio object: {type(audio).__name__}")
+
+
+# Extension -> (reader, format name)
+_READERS = {
+    '.mp3': (_read_id3, 'mp3'),
+    '.aac': (_read_id3, 'aac'),
+    '.mp4': (_read_mp4, 'mp4'),
+    '.m4a': (_read_mp4, 'm4a'),
+    '.alac': (_read_mp4, 'alac'),
+    '.flac': (_read_flac, 'flac'),
+    '.ogg': (_read_ogg, 'ogg'),
+    '.aiff': (_read_aiff, 'aiff'),
+    '.aif': (_read_aiff, 'aif'),
+    '.wav': (_read_wave, 'wav'),
+}
+
+
+def read_key_from_file(file_path, file_ext=None):
     """
     Read key and metadata (artist, title, album) from an audio file using mutagen.
 
@@ -242,364 +838,713 @@ def read_key_from_file(file_path):
     'initialkey', 'INITIALKEY', 'InitialKey', 'KEY', 'key', etc.
 
     Args:
-        file_path (Path): Path to audio file
+        file_path (str or Path): Path to audio file
+        file_ext (str): Lowercase extension including the dot, computed from
+            file_path if not given
 
     Returns:
         tuple: (success: bool, key_value: str or None, format: str, error_message: str or None,
                 artist: str or None, title: str or None, album: str or None)
     """
     try:
-        file_ext = file_path.suffix.lower()
+        if file_ext is None:
+            file_ext = os.path.splitext(file_path)[1].lower()
+        if file_ext not in _READERS:
+            # A missing file is reported as such, whatever its extension
+            if not os.path.exists(file_path):
+                return False, None, None, 'File not found', None, None, None
+            return False, None, None, f"Unsupported file format: {file_ext}", None, None, None
 
-        # MP3 files - read ID3v2 TKEY frame and metadata
-        if file_ext == '.mp3':
-            try:
-                audio = ID3(file_path)
-                key_value = str(audio['TKEY'].text[0]) if 'TKEY' in audio and audio['TKEY'].text else None
-                artist = str(audio['TPE1'].text[0]) if 'TPE1' in audio and audio['TPE1'].text else None
-                title = str(audio['TIT2'].text[0]) if 'TIT2' in audio and audio['TIT2'].text else None
-                album = str(audio['TALB'].text[0]) if 'TALB' in audio and audio['TALB'].text else None
-                return True, key_value, 'mp3', None, artist, title, album
-            except ID3NoHeaderError:
-                return True, None, 'mp3', None, None, None, None
+        with _open_buffered(file_path) as f:
+            return read_key_from_stream(f, file_ext)
 
-        # AAC files with ID3 tags (ADTS AAC)
-        elif file_ext == '.aac':
-            try:
-                audio = ID3(file_path)
-                key_value = str(audio['TKEY'].text[0]) if 'TKEY' in audio and audio['TKEY'].text else None
-                artist = str(audio['TPE1'].text[0]) if 'TPE1' in audio and audio['TPE1'].text else None
-                title = str(audio['TIT2'].text[0]) if 'TIT2' in audio and audio['TIT2'].text else None
-                album = str(audio['TALB'].text[0]) if 'TALB' in audio and audio['TALB'].text else None
-                return True, key_value, 'aac', None, artist, title, album
-            except ID3NoHeaderError:
-                return True, None, 'aac', None, None, None, None
+    except FileNotFoundError:
+        return False, None, None, 'File not found', None, None, None
+    except Exception as e:
+        return False, None, None, str(e), None, None, None
 
-        # MP4/M4A/ALAC files - read freeform tags and standard atoms
-        elif file_ext in ['.mp4', '.m4a', '.alac']:
-            audio = MP4(file_path)
-            # Check initialkey first (standard), then KEY (legacy) - case insensitive
-            key_value = get_mp4_field_case_insensitive(audio, '----:com.apple.iTunes:initialkey')
-            if not key_value:
-                key_value = get_mp4_field_case_insensitive(audio, '----:com.apple.iTunes:KEY')
-
-            # Read standard MP4 atoms for metadata
-            artist = None
-            title = None
-            album = None
-            if '\xa9ART' in audio and audio['\xa9ART']:
-                artist = str(audio['\xa9ART'][0])
-            if '\xa9nam' in audio and audio['\xa9nam']:
-                title = str(audio['\xa9nam'][0])
-            if '\xa9alb' in audio and audio['\xa9alb']:
-                album = str(audio['\xa9alb'][0])
-
-            return True, key_value, file_ext[1:], None, artist, title, album
-
-        # FLAC files - read Vorbis comments
-        elif file_ext == '.flac':
-            audio = FLAC(file_path)
-            # Check initialkey first (standard), then KEY (legacy) - case insensitive
-            key_value = get_vorbis_field_case_insensitive(audio, 'initialkey')
-            if not key_value:
-                key_value = get_vorbis_field_case_insensitive(audio, 'KEY')
 
-            # Read metadata from Vorbis comments
-            artist = get_vorbis_field_case_insensitive(audio, 'artist')
-            title = get_vorbis_field_case_insensitive(audio, 'title')
-            album = get_vorbis_field_case_insensitive(audio, 'album')
+def read_key_from_stream(f, file_ext):
+    """
+    Read key and metadata from an open binary file object, such as an io.BytesIO.
 
-            return True, key_value, 'flac', None, artist, title, album
+    Same field priority as read_key_from_file; the stream is read from its start.
 
-        # OGG Vorbis files - read Vorbis comments
-        elif file_ext == '.ogg':
-            audio = OggVorbis(file_path)
-            # Check initialkey first (standard), then KEY (legacy) - case insensitive
-            key_value = get_vorbis_field_case_insensitive(audio, 'initialkey')
-            if not key_value:
-                key_value = get_vorbis_field_case_insensitive(audio, 'KEY')
+    Args:
+        f: Seekable binary file object holding the whole audio file
+        file_ext (str): Lowercase extension including the dot, selects the reader
 
-            # Read metadata from Vorbis comments
-            artist = get_vorbis_field_case_insensitive(audio, 'artist')
-            title = get_vorbis_field_case_insensitive(audio, 'title')
-            album = get_vorbis_field_case_insensitive(audio, 'album')
+    Returns:
+        tuple: Same as read_key_from_file
+    """
+    try:
+        reader, format_type = _READERS.get(file_ext, (None, None))
+        if reader is None:
+            return False, None, None, f"Unsupported file format: {file_ext}", None, None, None
 
-            return True, key_value, 'ogg', None, artist, title, album
+        f.seek(0)
+        key_value, artist, title, album = reader(f)
 
-        # AIFF/AIF files - read ID3 tags
-        elif file_ext in ['.aiff', '.aif']:
-            audio = AIFF(file_path)
-            key_value = None
-            artist = None
-            title = None
-            album = None
+        return True, key_value, format_type, None, artist, title, album
 
-            if audio.tags:
-                key_value = str(audio.tags['TKEY'].text[0]) if 'TKEY' in audio.tags and audio.tags['TKEY'].text else None
-                artist = str(audio.tags['TPE1'].text[0]) if 'TPE1' in audio.tags and audio.tags['TPE1'].text else None
-                title = str(audio.tags['TIT2'].text[0]) if 'TIT2' in audio.tags and audio.tags['TIT2'].text else None
-                album = str(audio.tags['TALB'].text[0]) if 'TALB' in audio.tags and audio.tags['TALB'].text else None
+    except Exception as e:
+        return False, None, None, str(e), None, None, None
 
-            return True, key_value, file_ext[1:], None, artist, title, album
 
-        # WAV files - read ID3 tags
-        elif file_ext == '.wav':
-            audio = WAVE(file_path)
-            key_value = None
-            artist = None
-            title = None
-            album = None
+def _set_id3_key(tags, key_value):
+    """Replace the TKEY frame of ID3 tags with the given key."""
+    # A fresh frame per call: constructing one costs about the same as
+    # copying a template, and a frame shared between requests would keep
+    # whatever state mutagen leaves on it
+    tags.delall('TKEY')
+    tags.add(TKEY(encoding=3, text=key_value))
 
-            if audio.tags:
-                key_value = str(audio.tags['TKEY'].text[0]) if 'TKEY' in audio.tags and audio.tags['TKEY'].text else None
-                artist = str(audio.tags['TPE1'].text[0]) if 'TPE1' in audio.tags and audio.tags['TPE1'].text else None
-                title = str(audio.tags['TIT2'].text[0]) if 'TIT2' in audio.tags and audio.tags['TIT2'].text else None
-                album = str(audio.tags['TALB'].text[0]) if 'TALB' in audio.tags and audio.tags['TALB'].text else None
 
-            return True, key_value, 'wav', None, artist, title, album
+def _write_id3(f, key_value, legacy=False):
+    """Write MP3/AAC files - ID3v2.4 TKEY frame."""
+    try:
+        audio = ID3(f)
+    except ID3NoHeaderError:
+        # Create new ID3 tag if none exists
+        audio = ID3()
 
-        else:
-            return False, None, None, f"Unsupported file format: {file_ext}", None, None, None
+    _set_id3_key(audio, key_value)
+    _save_to(audio, f, v2_version=4)
+    return audio, None
+
+
+def _write_mp4(f, key_value, legacy=False):
+    """Write MP4/M4A/ALAC files - freeform tags."""
+    audio = _load_audio(MP4, f, for_write=True)
+    _set_mp4_key(audio, key_value, legacy)
+    _save_to(audio, f)
+    return audio, None
+
+
+def _set_mp4_key(audio, key_value, legacy=False):
+    """
+    Set the key on MP4 freeform tags.
+
+    Writes 'initialkey' (standard). With legacy, also writes 'KEY' for older
+    tools; otherwise any existing 'KEY' tag is removed so it can't go stale.
+    """
+    audio['----:com.apple.iTunes:initialkey'] = [key_value.encode('utf-8')]
+    if legacy:
+        audio['----:com.apple.iTunes:KEY'] = [key_value.encode('utf-8')]
+    else:
+        for name in [name for name in audio.keys()
+                     if name.lower() == '----:com.apple.itunes:key']:
+            del audio[name]
+
+
+def _set_vorbis_key(audio, key_value, legacy=False):
+    """
+    Set the key on FLAC/OGG Vorbis comments.
+
+    Writes 'initialkey' (standard). With legacy, also writes 'KEY' for older
+    tools; otherwise any existing 'KEY' field is removed so it can't go stale.
+    """
+    audio['initialkey'] = key_value
+    if legacy:
+        audio['KEY'] = key_value
+    elif 'KEY' in audio:
+        del audio['KEY']
+
+
+def _find_flac_audio_offset(f):
+    """
+    Find where the audio frames of a FLAC file start.
+
+    Walks the metadata block headers (after an optional ID3v2 prefix) and
+    checks that a frame sync code follows the last block.
+
+    Args:
+        f: Binary file object
+
+    Returns:
+        int or None: Offset of the first audio frame, or None if the layout
+            isn't what we expect
+    """
+    f.seek(0)
+    head = f.read(10)
+    offset = 0
+    if head[:3] == b'ID3':
+        offset = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+        f.seek(offset)
+        head = f.read(4)
+    if head[:4] != b'fLaC':
+        return None
+    offset += 4
+
+    while True:
+        f.seek(offset)
+        block_header = f.read(4)
+        if len(block_header) < 4:
+            return None
+        offset += 4 + int.from_bytes(block_header[1:4], 'big')
+        if block_header[0] & 0x80:
+            break
+
+    f.seek(offset)
+    sync = f.read(2)
+    if len(sync) < 2 or sync[0] != 0xff or (sync[1] & 0xfe) != 0xf8:
+        return None
+    return offset
 
-    except Exception as e:
-        return False, None, None, str(e), None, None, None
 
+def _write_flac(f, key_value, legacy=False):
+    """
+    Write FLAC files - Vorbis comments.
+
+    Mutagen saves FLAC in place, shifting all audio data in small block moves
+    whenever the metadata changes size. That is slow on copy-on-write and
+    network filesystems, so the new metadata is rendered separately: if it
+    fits in the old metadata area it is written in place, otherwise the
+    caller rewrites the file in one sequential pass (see _replace_file).
+
+    Hardlinked files, and platforms where _replace_file can't carry extended
+    attributes and ACLs over (no os.listxattr), are saved in place by mutagen.
+
+    Returns:
+        tuple: (audio, rewrite) - the updated mutagen object, and
+            (metadata, audio_offset) if the file must be rewritten with new
+            metadata followed by the audio from audio_offset, None if the
+            write is complete
+    """
+    audio = _load_audio(FLAC, f, for_write=True)
+    _set_vorbis_key(audio, key_value, legacy)
+
+    st = os.fstat(f.fileno())
+    audio_offset = _find_flac_audio_offset(f)
+    if audio_offset is None or st.st_nlink > 1 or not hasattr(os, 'listxattr'):
+        # Replacing a hardlinked file would detach this path from its other links
+        _save_to(audio, f)
+        return audio, None
+
+    # Let mutagen render the metadata against a copy of just the metadata
+    # area, keeping its padding policy based on the real audio size
+    content_size = st.st_size - audio_offset
+    f.seek(0)
+    metadata = io.BytesIO(f.read(audio_offset))
+    audio.save(metadata, padding=lambda info: PaddingInfo(info.padding, content_size).get_default_padding())
+    metadata = metadata.getvalue()
+
+    if len(metadata) != audio_offset:
+        return audio, (metadata, audio_offset)
+
+    f.seek(0)
+    f.write(metadata)
+    return audio, None
+
+
+def _write_ogg(f, key_value, legacy=False):
+    """Write OGG Vorbis files - Vorbis comments."""
+    audio = _load_audio(OggVorbis, f, for_write=True)
+    _set_vorbis_key(audio, key_value, legacy)
+    _save_to(audio, f)
+    return audio, None
 
-def write_key_to_file(file_path, key_value):
+
+def _write_id3_chunk(audio, f, key_value):
+    """Write AIFF/WAV files - ID3 tags stored in an 'ID3 ' chunk."""
+    _set_id3_chunk_key(audio, key_value)
+    _save_to(audio, f)
+    return audio, None
+
+
+def _set_id3_chunk_key(audio, key_value):
+    """Set the key on the ID3 tags of an AIFF/WAVE object, adding tags if needed."""
+    if audio.tags is None:
+        audio.add_tags()
+    _set_id3_key(audio.tags, key_value)
+
+
+def _write_aiff(f, key_value, legacy=False):
+    """Write AIFF/AIF files - ID3 tags."""
+    return _write_id3_chunk(AIFF(f), f, key_value)
+
+
+def _write_wave(f, key_value, legacy=False):
+    """Write WAV files - ID3 tags."""
+    return _write_id3_chunk(WAVE(f), f, key_value)
+
+
+def set_key_on_audio(audio, key_value, legacy=False):
+    """
+    Set the key on an already-parsed mutagen object, in memory only.
+
+    Uses the same fields as write_key_to_file; the caller saves the object.
+
+    Args:
+        audio: Mutagen ID3, MP4, FLAC, OggVorbis, AIFF or WAVE object
+        key_value (str): Key value to set
+        legacy (bool): Also set the legacy 'KEY' field for FLAC/OGG/MP4
+            (default: False, which removes it)
+    """
+    if isinstance(audio, MP4):
+        _set_mp4_key(audio, key_value, legacy)
+    elif isinstance(audio, (FLAC, OggVorbis)):
+        _set_vorbis_key(audio, key_value, legacy)
+    elif isinstance(audio, ID3):
+        _set_id3_key(audio, key_value)
+    elif isinstance(audio, (AIFF, WAVE)):
+        _set_id3_chunk_key(audio, key_value)
+    else:
+        raise TypeError(f"Unsupported audio object: {type(audio).__name__}")
+
+
+# Extension -> (writer, format name). Writers return (audio, rewrite): the
+# mutagen object they updated, and None once the file is written or
+# (metadata, audio_offset) if it must be rewritten as a whole
+_WRITERS = {
+    '.mp3': (_write_id3, 'mp3'),
+    '.aac': (_write_id3, 'aac'),
+    '.mp4': (_write_mp4, 'mp4'),
+    '.m4a': (_write_mp4, 'm4a'),
+    '.alac': (_write_mp4, 'alac'),
+    '.flac': (_write_flac, 'flac'),
+    '.ogg': (_write_ogg, 'ogg'),
+    '.aiff': (_write_aiff, 'aiff'),
+    '.aif': (_write_aiff, 'aif'),
+    '.wav': (_write_wave, 'wav'),
+}
+
+
+def _drop_page_cache(f):
+    """
+    Tell the kernel a just-written file won't be read back soon.
+
+    POSIX_FADV_DONTNEED starts write-back of the dirty pages right away and
+    drops the clean ones, so bulk tagging doesn't build up dirty page cache
+    that is then flushed in bursts. Only a hint; a no-op where unsupported
+    (e.g. Windows and macOS).
+
+    Args:
+        f: Binary file object that was written through
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        f.flush()
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+def _copy_xattrs(src_fd, dst_fd):
+    """Copy all extended attributes (POSIX ACLs included) from one open file to another."""
+    try:
+        names = os.listxattr(src_fd)
+    except OSError as e:
+        if e.errno in (errno.ENOTSUP, errno.EOPNOTSUPP):
+            return  # filesystem without extended attributes
+        raise
+    for xattr_name in names:
+        os.setxattr(dst_fd, xattr_name, os.getxattr(src_fd, xattr_name))
+
+
+def _replace_file(file_path, metadata, audio_offset, fsync=False):
+    """
+    Rewrite an audio file with new metadata in one sequential pass.
+
+    Streams the new metadata plus the original audio data into a sibling
+    temporary file with the original's owner, group, mode and extended
+    attributes (which include POSIX ACLs), then atomically replaces the
+    original with it.
+
+    Args:
+        file_path (str or Path): Path to audio file
+        metadata (bytes): New file contents up to the audio data
+        audio_offset (int): Offset of the audio data in the original file
+        fsync (bool): fsync the new file before replacing (default: False)
+
+    Raises:
+        OSError: The file couldn't be replaced without losing any of the
+            above (e.g. the directory isn't writable, or the owner can't be
+            kept); the original is left untouched, so the caller can save in
+            place instead
+    """
+    # Replace the target of a symlink, not the link itself
+    target = os.path.realpath(file_path)
+    directory, name = os.path.split(target)
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with open(fd, 'wb', buffering=IO_BUFFER_SIZE) as out, \
+                _open_buffered(target) as src:
+            src_st = os.fstat(src.fileno())
+            out_st = os.fstat(out.fileno())
+            if (out_st.st_uid, out_st.st_gid) != (src_st.st_uid, src_st.st_gid):
+                os.chown(out.fileno(), src_st.st_uid, src_st.st_gid)
+            os.chmod(out.fileno(), stat.S_IMODE(src_st.st_mode))
+            _copy_xattrs(src.fileno(), out.fileno())
+            out.write(metadata)
+            src.seek(audio_offset)
+            shutil.copyfileobj(src, out, IO_BUFFER_SIZE)
+            if fsync:
+                out.flush()
+                os.fsync(out.fileno())
+            _drop_page_cache(out)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_key_to_file(file_path, key_value, fsync=False, file_ext=None, legacy=False):
     """
     Write key metadata to an audio file using mutagen.
 
     Args:
-        file_path (Path): Path to audio file
+        file_path (str or Path): Path to audio file
         key_value (str): Key value to write (e.g., "9A", "E minor", "2m")
+        fsync (bool): Flush the write handle to disk before returning (default: False)
+        file_ext (str): Lowercase extension including the dot, computed from
+            file_path if not given
+        legacy (bool): Also write the legacy 'KEY' field for FLAC/OGG/MP4
+            formats (default: False, which removes it)
 
     Returns:
         tuple: (success: bool, error_message: str or None, format: str)
     """
     try:
-        file_ext = file_path.suffix.lower()
+        if file_ext is None:
+            file_ext = os.path.splitext(file_path)[1].lower()
+        writer, format_type = _WRITERS.get(file_ext, (None, None))
+        if writer is None:
+            # A missing file is reported as such, whatever its extension
+            if not os.path.exists(file_path):
+                return False, 'File not found', None
+            return False, f"Unsupported file format: {file_ext}", None
 
-        # MP3 files - use ID3v2.4 TKEY frame
-        if file_ext == '.mp3':
+        with _open_buffered(file_path, 'r+b') as f:
+            audio, rewrite = writer(f, key_value, legacy)
+            if rewrite is None:
+                if fsync:
+                    # Sync the handle mutagen actually wrote through
+                    f.flush()
+                    os.fsync(f.fileno())
+                _drop_page_cache(f)
+
+        # The handle must be closed before replacing the file on Windows
+        if rewrite is not None:
+            metadata, audio_offset = rewrite
             try:
-                audio = ID3(file_path)
-            except ID3NoHeaderError:
-                # Create new ID3 tag if none exists
-                audio = ID3()
-
-            # Delete existing TKEY frame and add new one
-            audio.delall('TKEY')
-            audio.add(TKEY(encoding=3, text=key_value))
-            audio.save(file_path, v2_version=4)
-            sync_file(file_path)
-            return True, None, 'mp3'
-
-        # AAC files with ID3 tags (ADTS AAC)
-        elif file_ext == '.aac':
-            try:
-                audio = ID3(file_path)
-            except ID3NoHeaderError:
-                # Create new ID3 tag if none exists
-                audio = ID3()
-
-            # Delete existing TKEY frame and add new one
-            audio.delall('TKEY')
-            audio.add(TKEY(encoding=3, text=key_value))
-            audio.save(file_path, v2_version=4)
-            sync_file(file_path)
-            return True, None, 'aac'
-
-        # MP4/M4A/ALAC files - use freeform tags
-        # Write to both 'initialkey' (standard) and 'KEY' (legacy) for compatibility
-        elif file_ext in ['.mp4', '.m4a', '.alac']:
-            audio = MP4(file_path)
-            audio['----:com.apple.iTunes:initialkey'] = key_value.encode('utf-8')
-            audio['----:com.apple.iTunes:KEY'] = key_value.encode('utf-8')
-            audio.save()
-            sync_file(file_path)
-            return True, None, file_ext[1:]
-
-        # FLAC files - use Vorbis comments
-        # Write to both 'initialkey' (standard) and 'KEY' (legacy) for compatibility
-        elif file_ext == '.flac':
-            audio = FLAC(file_path)
-            audio['initialkey'] = key_value
-            audio['KEY'] = key_value
-            audio.save()
-            sync_file(file_path)
-            return True, None, 'flac'
-
-        # OGG Vorbis files - use Vorbis comments
-        # Write to both 'initialkey' (standard) and 'KEY' (legacy) for compatibility
-        elif file_ext == '.ogg':
-            audio = OggVorbis(file_path)
-            audio['initialkey'] = key_value
-            audio['KEY'] = key_value
-            audio.save()
-            sync_file(file_path)
-            return True, None, 'ogg'
-
-        # AIFF/AIF files - use ID3 tags
-        elif file_ext in ['.aiff', '.aif']:
-            audio = AIFF(file_path)
-            if audio.tags is None:
-                audio.add_tags()
-            # Delete existing TKEY frame and add new one
-            audio.tags.delall('TKEY')
-            audio.tags.add(TKEY(encoding=3, text=key_value))
-            audio.save()
-            sync_file(file_path)
-            return True, None, file_ext[1:]
-
-        # WAV files - use ID3 tags
-        elif file_ext == '.wav':
-            audio = WAVE(file_path)
-            if audio.tags is None:
-                audio.add_tags()
-            # Delete existing TKEY frame and add new one
-            audio.tags.delall('TKEY')
-            audio.tags.add(TKEY(encoding=3, text=key_value))
-            audio.save()
-            sync_file(file_path)
-            return True, None, 'wav'
+                _replace_file(file_path, metadata, audio_offset, fsync=fsync)
+            except OSError:
+                # Not replaceable as is (read-only directory, foreign owner,
+                # ...): let mutagen save in place, as it does for other formats
+                with _open_buffered(file_path, 'r+b') as f:
+                    _save_to(audio, f)
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                    _drop_page_cache(f)
+
+        return True, None, format_type
+
+    except FileNotFoundError:
+        return False, 'File not found', None
+    except Exception as e:
+        return False, str(e), None
+
+
+def process_request(request, fsync=False):
+    """
+    Process a single key tagging or reading request.
+
+    Module-level (rather than a server method) so it can run in a worker process.
+
+    Args:
+        request (dict): Request with 'id', 'path', and optionally 'key' fields
+            - If 'key' is provided: writes key to file
+            - If 'key' is missing/empty: reads key from file
+            - 'legacy' (optional): also write the legacy KEY field
+        fsync (bool): fsync files after each write (default: False)
+
+    Returns:
+        dict: Response message
+    """
+    request_id = request.get('id', 'unknown')
+    file_path = request.get('path', '')
+    key_value = request.get('key', '')
+    legacy = bool(request.get('legacy', False))
 
+    try:
+        # Derive name and extension once with plain string operations
+        filename = os.path.basename(file_path)
+        file_ext = os.path.splitext(file_path)[1].lower()
+
+        # No up-front exists() check: opening the file reports a missing
+        # file as 'File not found' without the extra stat
+        # If no key provided, treat as read request
+        if not key_value or key_value == '':
+            # The key read and the album art extraction share one parse
+            with _request_audio_cache():
+                success, read_key, format_type, error_msg, artist, title, album = read_key_from_file(file_path, file_ext)
+                album_art_path = extract_album_art(file_path, file_ext) if success else None
+
+            if success:
+                response = {
+                    'id': request_id,
+                    'status': 'success',
+                    'key': read_key,
+                    'filename': filename,
+                    'format': format_type,
+                    'artist': artist,
+                    'title': title,
+                    'album': album
+                }
+
+                # Add album art path if extracted
+                if album_art_path:
+                    response['albumArtPath'] = album_art_path
+
+                return response
+            else:
+                return {
+                    'id': request_id,
+                    'status': 'error',
+                    'error': error_msg or 'Failed to read key',
+                    'filename': filename
+                }
+
+        # Write key to file
+        success, error_msg, format_type = write_key_to_file(
+            file_path, key_value, fsync=fsync, file_ext=file_ext, legacy=legacy)
+
+        if success:
+            return {
+                'id': request_id,
+                'status': 'success',
+                'key': key_value,
+                'filename': filename,
+                'format': format_type
+            }
         else:
-            return False, f"Unsupported file format: {file_ext}", None
+            return {
+                'id': request_id,
+                'status': 'error',
+                'error': error_msg,
+                'filename': filename
+            }
 
     except Exception as e:
-        return False, str(e), None
+        return {
+            'id': request_id,
+            'status': 'error',
+            'error': str(e),
+            'filename': os.path.basename(file_path) if file_path else 'unknown'
+        }
+
+
+def process_batch(request, fsync=False):
+    """
+    Process a batch of tagging/reading entries sent as a single request.
+
+    Entries are handled one after another in the same worker, so a batch
+    pays the JSON parse and pool dispatch cost once instead of per file.
+    Send several batches to keep all workers busy.
+
+    Args:
+        request (dict): Request with 'id' and a 'batch' list of entries, each
+            shaped like a single request ('path' and optionally 'key')
+        fsync (bool): fsync files after each write (default: False)
+
+    Returns:
+        dict: Batch response with one result per entry, in input order
+    """
+    request_id = request.get('id', 'unknown')
+    entries = request.get('batch')
+
+    if not isinstance(entries, list):
+        return {
+            'id': request_id,
+            'status': 'error',
+            'error': 'Batch must be a list of requests'
+        }
+
+    results = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            results.append({'status': 'error', 'error': 'Invalid batch entry'})
+            continue
+        result = process_request(entry, fsync=fsync)
+        # Entries don't need ids of their own; results are matched by position
+        if 'id' not in entry:
+            del result['id']
+        results.append(result)
+
+    return {
+        'id': request_id,
+        'status': 'batch',
+        'results': results
+    }
+
+
+def handle_request(line, fsync=False):
+    """
+    Parse and handle a request line. Runs in a worker process.
+
+    Args:
+        line (bytes): One NDJSON request line (UTF-8)
+        fsync (bool): fsync files after each write (default: False)
+
+    Returns:
+        dict or None: Response message, or None if the line was not valid JSON
+    """
+    try:
+        request = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        print(f"Invalid JSON: {e}", file=sys.stderr)
+        return None
+
+    if 'batch' in request:
+        return process_batch(request, fsync=fsync)
+    return process_request(request, fsync=fsync)
+
+
+def request_error_response(line, error):
+    """
+    Build an error response for a request line without processing it.
+
+    Used by the server when a request can't be answered normally (its
+    worker process died).
+
+    Args:
+        line (bytes): The NDJSON request line
+        error (str): Error message
+
+    Returns:
+        dict or None: Error response, or None if the line is not a JSON object
+    """
+    try:
+        request = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(request, dict):
+        return None
+
+    response = {'id': request.get('id', 'unknown'), 'status': 'error', 'error': error}
+    file_path = request.get('path')
+    if isinstance(file_path, str):
+        response['filename'] = os.path.basename(file_path)
+    return response
 
 
 class KeyTaggingServer:
     """
     Server that processes key tagging requests via stdin/stdout.
 
-    Uses thread pool for concurrent processing.
+    Uses a process pool for concurrent processing: mutagen's parsing and
+    serialization is pure Python and holds the GIL, so threads would
+    serialize it. Responses are written by a single writer thread so every
+    NDJSON line reaches stdout intact.
     """
 
-    def __init__(self, num_workers=4):
+    def __init__(self, num_workers=4, fsync=False):
         """
         Initialize the server.
 
         Args:
-            num_workers (int): Number of worker threads (default: 4)
+            num_workers (int): Number of worker processes (default: 4)
+            fsync (bool): fsync files after each write (default: False)
         """
         self.num_workers = num_workers
-        self.executor = ThreadPoolExecutor(max_workers=num_workers)
+        self.fsync = fsync
+        self.executor = self._new_executor()
+        self.messages = queue.Queue()
+        # Bounds submitted-but-unfinished requests; reading stdin blocks
+        # while all slots are taken, pushing back on the client through the pipe
+        self.pending = threading.BoundedSemaphore(num_workers * MAX_PENDING_PER_WORKER)
+
+        # Binary stdio (see the UTF-8 note at the top of the module)
+        self.stdin = io.BufferedReader(
+            io.FileIO(sys.stdin.fileno(), 'rb', closefd=False),
+            buffer_size=STDIN_BUFFER_SIZE
+        )
+        self.stdout = io.BufferedWriter(
+            io.FileIO(sys.stdout.fileno(), 'wb', closefd=False),
+            buffer_size=STDOUT_BUFFER_SIZE
+        )
+        # Serializes stdout writes so a message sent outside the writer
+        # thread can never interleave with a response line
+        self._stdout_lock = threading.Lock()
 
         # Log configuration
         print(f"Server configuration:", file=sys.stderr)
         print(f"  Workers: {self.num_workers}", file=sys.stderr)
+        print(f"  Fsync: {self.fsync}", file=sys.stderr)
 
         self.running = True
 
-    def send_message(self, message):
-        """Send a JSON message to stdout."""
-        try:
-            json_str = json.dumps(message)
-            print(json_str, flush=True)
-        except Exception as e:
-            print(f"Error sending message: {e}", file=sys.stderr)
+    def _new_executor(self):
+        """Create the worker process pool."""
+        # Always spawn: fork is unavailable on Windows, and forking a process
+        # that already runs threads is unsafe on macOS/Linux
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
 
-    def process_request(self, request):
+    def _submit(self, line):
         """
-        Process a single key tagging or reading request.
+        Submit a request line to the process pool.
 
-        Args:
-            request (dict): Request with 'id', 'path', and optionally 'key' fields
-                - If 'key' is provided: writes key to file
-                - If 'key' is missing/empty: reads key from file
-
-        Returns:
-            dict: Response message
+        If a worker process died (killed by the OOM killer, a crash in a C
+        extension, ...), the pool is broken and refuses new work; it is then
+        replaced by a fresh pool and the line submitted there.
         """
-        request_id = request.get('id', 'unknown')
-        file_path = request.get('path', '')
-        key_value = request.get('key', '')
-
         try:
-            audio_path = Path(file_path)
-
-            if not audio_path.exists():
-                return {
-                    'id': request_id,
-                    'status': 'error',
-                    'error': 'File not found',
-                    'filename': audio_path.name
-                }
-
-            # If no key provided, treat as read request
-            if not key_value or key_value == '':
-                success, read_key, format_type, error_msg, artist, title, album = read_key_from_file(audio_path)
-
-                if success:
-                    # Extract album art if present
-                    album_art_path = extract_album_art(audio_path)
-
-                    response = {
-                        'id': request_id,
-                        'status': 'success',
-                        'key': read_key,
-                        'filename': audio_path.name,
-                        'format': format_type,
-                        'artist': artist,
-                        'title': title,
-                        'album': album
-                    }
-
-                    # Add album art path if extracted
-                    if album_art_path:
-                        response['albumArtPath'] = album_art_path
-
-                    return response
-                else:
-                    return {
-                        'id': request_id,
-                        'status': 'error',
-                        'error': error_msg or 'Failed to read key',
-                        'filename': audio_path.name
-                    }
-
-            # Write key to file
-            success, error_msg, format_type = write_key_to_file(audio_path, key_value)
+            return self.executor.submit(handle_request, line, self.fsync)
+        except BrokenProcessPool:
+            print("Worker process died, restarting the process pool", file=sys.stderr)
+            self.executor.shutdown(wait=False)
+            self.executor = self._new_executor()
+            return self.executor.submit(handle_request, line, self.fsync)
 
-            if success:
-                return {
-                    'id': request_id,
-                    'status': 'success',
-                    'key': key_value,
-                    'filename': audio_path.name,
-                    'format': format_type
-                }
-            else:
-                return {
-                    'id': request_id,
+    def send_message(self, message):
+        """Send a JSON message to stdout."""
+        try:
+            try:
+                payload = orjson.dumps(message) + b'\n'
+            except orjson.JSONEncodeError as e:
+                # orjson is stricter than json (no lone surrogates, no ints
+                # beyond 64 bits); still answer the request so the client
+                # doesn't wait for it forever
+                print(f"Error encoding response: {e}", file=sys.stderr)
+                payload = orjson.dumps({
+                    'id': message.get('id', 'unknown'),
                     'status': 'error',
-                    'error': error_msg,
-                    'filename': audio_path.name
-                }
-
+                    'error': f"Response could not be encoded: {e}"
+                }) + b'\n'
+            with self._stdout_lock:
+                self.stdout.write(payload)
+                self.stdout.flush()
         except Exception as e:
-            return {
-                'id': request_id,
-                'status': 'error',
-                'error': str(e),
-                'filename': Path(file_path).name if file_path else 'unknown'
-            }
-
-    def handle_request(self, line):
-        """Parse and handle a request line."""
-        try:
-            request = json.loads(line)
+            print(f"Error sending message: {e}", file=sys.stderr)
 
-            # Process the request
-            response = self.process_request(request)
-            self.send_message(response)
+    def queue_message(self, message):
+        """Queue a JSON message for the writer thread."""
+        self.messages.put(message)
 
-        except json.JSONDecodeError as e:
-            print(f"Invalid JSON: {e}", file=sys.stderr)
+    def on_request_done(self, line, future):
+        """Queue the response of a finished worker task."""
+        self.pending.release()
+        try:
+            response = future.result()
+        except BrokenProcessPool:
+            # The request was in the pool when a worker died; answer it so
+            # the client doesn't wait for it forever
+            response = request_error_response(line, 'Worker process terminated')
         except Exception as e:
             print(f"Error handling request: {e}", file=sys.stderr)
+            return
+
+        if response is not None:
+            self.queue_message(response)
 
     def run(self):
         """Main server loop - read from stdin and process requests."""
@@ -607,31 +1552,55 @@ class KeyTaggingServer:
         self.send_message({'type': 'ready'})
         print("Server ready, waiting for requests...", file=sys.stderr)
 
-        # Start heartbeat thread
-        def heartbeat():
-            while self.running:
-                time.sleep(30)
-                if self.running:
-                    self.send_message({'type': 'heartbeat'})
-
-        heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
-        heartbeat_thread.start()
+        # Start writer thread - the only thread that writes to stdout from here
+        # on. It also sends the heartbeat: waiting on the queue with a timeout
+        # up to the next monotonic deadline replaces a dedicated sleeping thread
+        # (stdin can't be polled with a timeout instead, Windows pipes don't
+        # support select())
+        def writer():
+            next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+            while True:
+                try:
+                    message = self.messages.get(
+                        timeout=max(0.0, next_heartbeat - time.monotonic()))
+                except queue.Empty:
+                    message = {'type': 'heartbeat'}
+                if message is None:
+                    break
+                self.send_message(message)
+                if time.monotonic() >= next_heartbeat:
+                    if message.get('type') != 'heartbeat':
+                        self.send_message({'type': 'heartbeat'})
+                    next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        writer_thread.start()
 
         # Process requests from stdin
         try:
-            for line in sys.stdin:
+            for line in self.stdin:
                 line = line.strip()
                 if not line:
                     continue
 
-                # Submit to thread pool for concurrent processing
-                self.executor.submit(self.handle_request, line)
+                # Submit to process pool for concurrent processing, waiting
+                # for a free slot first
+                self.pending.acquire()
+                try:
+                    future = self._submit(line)
+                except BaseException:
+                    self.pending.release()
+                    raise
+                future.add_done_callback(partial(self.on_request_done, line))
 
         except KeyboardInterrupt:
             print("Shutting down...", file=sys.stderr)
         finally:
             self.running = False
             self.executor.shutdown(wait=True)
+            # Drain queued responses before exiting
+            self.messages.put(None)
+            writer_thread.join()
             print("Server stopped", file=sys.stderr)
 
 
@@ -641,13 +1610,17 @@ def main():
 
     parser = argparse.ArgumentParser(description="Key Tagging Server (stdin/stdout JSON protocol)")
     parser.add_argument('-w', '--workers', type=int, default=4,
-                        help="Number of worker threads (default: 4)")
+                        help="Number of worker processes (default: 4)")
+    parser.add_argument('--fsync', action='store_true',
+                        help="fsync each file after writing for durability (slower)")
 
     args = parser.parse_args()
 
-    server = KeyTaggingServer(num_workers=args.workers)
+    server = KeyTaggingServer(num_workers=args.workers, fsync=args.fsync)
     server.run()
 
 
 if __name__ == '__main__':
+    # Required for worker processes in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
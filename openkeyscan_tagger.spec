@@ -25,6 +25,7 @@ hiddenimports = [
     'mutagen.oggvorbis',
     'mutagen.aiff',
     'mutagen.wave',
+    'orjson',
 ]
 
 a = Analysis(
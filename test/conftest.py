@@ -0,0 +1,34 @@
+"""
+Shared pytest configuration for the Python test suites.
+
+Run with: python3 -m pytest -n auto test_lexicon_compatibility.py --test-files-dir ./test-files
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make openkeyscan_tagger (in the parent directory) importable, once per session
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# test_read_function.py is a standalone script (run directly by run-all-tests.js),
+# not a pytest module
+collect_ignore = ['test_read_function.py']
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--test-files-dir',
+        default=str(Path(__file__).parent / 'test-files'),
+        help='Directory containing the test.<ext> audio files (default: test/test-files)'
+    )
+
+
+@pytest.fixture(scope='session')
+def test_files_dir(request):
+    """Directory containing the test audio files; skips the tests if missing."""
+    path = Path(request.config.getoption('--test-files-dir'))
+    if not path.exists():
+        pytest.skip(f"Test files directory not found: {path}")
+    return path
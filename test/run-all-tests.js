@@ -6,6 +6,7 @@
  * 1. test-tagger.js - Write operations and dual-field verification
  * 2. test_read_function.py - Read function comprehensive tests
  * 3. test_lexicon_compatibility.py - Cross-compatibility tests
+ * 4. test_server.py, test_tag_io.py - Server protocol and file I/O tests
  */
 
 import { spawn } from 'child_process';
@@ -121,20 +122,30 @@ async function runAllTests() {
       'Write Operations & Dual-Field Verification (JS)'
     );
 
-    // Test 2: Python read function comprehensive tests
+    // Test 2: Python read function comprehensive tests (round trips through
+    // write_key_to_file/read_key_from_file rather than one mutagen handle)
     await runTest(
       'python3',
       [resolve(__dirname, 'test_read_function.py'), testFilesDir],
       'Read Function Comprehensive Tests (Python)'
     );
 
-    // Test 3: Python lexicon-tagger compatibility tests
+    // Test 3: Python lexicon-tagger compatibility tests (pytest, parallel via xdist)
     await runTest(
       'python3',
-      [resolve(__dirname, 'test_lexicon_compatibility.py'), testFilesDir],
+      ['-m', 'pytest', '-n', 'auto', resolve(__dirname, 'test_lexicon_compatibility.py'),
+       '--test-files-dir', testFilesDir],
       'lexicon-tagger Cross-Compatibility Tests (Python)'
     );
 
+    // Test 4: Python server protocol and file I/O tests (pytest, parallel via xdist)
+    await runTest(
+      'python3',
+      ['-m', 'pytest', '-n', 'auto', resolve(__dirname, 'test_server.py'),
+       resolve(__dirname, 'test_tag_io.py'), '--test-files-dir', testFilesDir],
+      'Server Protocol & File I/O Tests (Python)'
+    );
+
     // Print summary
     printSummary();
 
@@ -0,0 +1,13 @@
+"""
+Scratch space for the test suites' working copies of the test files
+"""
+
+import os
+
+
+def tmpfs_dir():
+    """
+    Directory for scratch copies: /dev/shm when it is available and writable
+    (a RAM-backed tmpfs on Linux), else None for the system default temp directory.
+    """
+    return '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
@@ -2,7 +2,9 @@
 /**
  * Test suite for key tagging server
  *
- * Tests writing keys to various audio formats and verifies with music-metadata
+ * Tests writing keys to various audio formats and verifies with music-metadata,
+ * once in legacy mode (initialkey and KEY) and once in the default mode
+ * (initialkey only, any existing KEY removed)
  */
 
 import { spawn } from 'child_process';
@@ -127,7 +129,7 @@ class KeyTaggingService {
     }
   }
 
-  tagFile(filePath, keyValue, timeoutMs = 10000) {
+  tagFile(filePath, keyValue, timeoutMs = 10000, legacy = false) {
     return new Promise((promiseResolve, promiseReject) => {
       if (!this.isReady) {
         return promiseReject(new Error('Server not ready'));
@@ -152,7 +154,8 @@ class KeyTaggingService {
       const request = {
         id: requestId,
         path: absolutePath,
-        key: keyValue
+        key: keyValue,
+        legacy
       };
 
       try {
@@ -368,12 +371,14 @@ async function runTests(serverPath, testFilesDir) {
       const format = FILE_FORMATS.find(f => f.ext === ext);
       const testKey = TEST_KEYS[keyIndex % TEST_KEYS.length];
       keyIndex++;
+      const isDualFieldFormat = ['flac', 'ogg', 'mp4', 'm4a', 'alac'].includes(ext);
 
-      process.stdout.write(`Testing ${format.name.padEnd(6)} ... `);
+      const legacyName = `${format.name} (legacy)`;
+      process.stdout.write(`Testing ${legacyName.padEnd(16)} ... `);
 
       try {
-        // Write key to file
-        const writeResult = await service.tagFile(filePath, testKey);
+        // Write key to file (legacy mode, so both fields are written)
+        const writeResult = await service.tagFile(filePath, testKey, 10000, true);
 
         // Debug: Show write result
         // console.log(`\n  Write result:`, writeResult);
@@ -385,27 +390,66 @@ async function runTests(serverPath, testFilesDir) {
 
         // For formats that support dual fields, verify both are written
         const dualFieldCheck = await verifyBothFieldsWritten(filePath, testKey);
-        const isDualFieldFormat = ['flac', 'ogg', 'mp4', 'm4a', 'alac'].includes(ext);
 
         if (readKey === testKey) {
           // Check if both fields are present for dual-field formats
           if (isDualFieldFormat && !dualFieldCheck.bothPresent) {
             console.log(`⚠️  PARTIAL (wrote "${testKey}", read "${readKey}", but missing dual fields)`);
             console.log(`    initialkey="${dualFieldCheck.initialkey}", KEY="${dualFieldCheck.KEY}"`);
-            results.push({ format: format.name, ext, success: false, key: testKey, readKey, error: 'Missing dual fields' });
+            results.push({ format: legacyName, ext, success: false, key: testKey, readKey, error: 'Missing dual fields' });
           } else {
             const dualFieldMsg = isDualFieldFormat ? ' [both fields ✓]' : '';
             console.log(`✅ SUCCESS (wrote "${testKey}", read "${readKey}"${dualFieldMsg})`);
-            results.push({ format: format.name, ext, success: true, key: testKey });
+            results.push({ format: legacyName, ext, success: true, key: testKey });
           }
         } else {
           console.log(`⚠️  MISMATCH (wrote "${testKey}", read "${readKey || 'null'}")`);
           console.log(`    Server response:`, writeResult);
-          results.push({ format: format.name, ext, success: false, key: testKey, readKey, error: 'Key mismatch' });
+          results.push({ format: legacyName, ext, success: false, key: testKey, readKey, error: 'Key mismatch' });
         }
       } catch (err) {
         console.log(`❌ FAILED (${err.message})`);
-        results.push({ format: format.name, ext, success: false, key: testKey, error: err.message });
+        results.push({ format: legacyName, ext, success: false, key: testKey, error: err.message });
+      }
+
+      // Default mode: a legacy KEY left by an earlier write must be removed
+      const seedKey = TEST_KEYS[keyIndex % TEST_KEYS.length];
+      const defaultKey = TEST_KEYS[(keyIndex + 1) % TEST_KEYS.length];
+      keyIndex += 2;
+      const defaultName = `${format.name} (default)`;
+
+      process.stdout.write(`Testing ${defaultName.padEnd(16)} ... `);
+
+      try {
+        // Pre-seed KEY with a legacy write
+        await service.tagFile(filePath, seedKey, 10000, true);
+        await new Promise(resolve => setTimeout(resolve, 500));
+        const seeded = await verifyBothFieldsWritten(filePath, seedKey);
+        if (isDualFieldFormat && seeded.KEY !== seedKey) {
+          throw new Error(`KEY not pre-seeded (KEY="${seeded.KEY}")`);
+        }
+
+        // Default write: initialkey only
+        const writeResult = await service.tagFile(filePath, defaultKey);
+        await new Promise(resolve => setTimeout(resolve, 500));
+        const readKey = await verifyKeyInFile(filePath, defaultKey);
+        const fieldCheck = await verifyBothFieldsWritten(filePath, defaultKey);
+
+        if (readKey !== defaultKey) {
+          console.log(`⚠️  MISMATCH (wrote "${defaultKey}", read "${readKey || 'null'}")`);
+          console.log(`    Server response:`, writeResult);
+          results.push({ format: defaultName, ext, success: false, key: defaultKey, readKey, error: 'Key mismatch' });
+        } else if (isDualFieldFormat && fieldCheck.KEY) {
+          console.log(`⚠️  STALE KEY (wrote "${defaultKey}", legacy KEY still "${fieldCheck.KEY}")`);
+          results.push({ format: defaultName, ext, success: false, key: defaultKey, readKey, error: 'Legacy KEY not removed' });
+        } else {
+          const removedMsg = isDualFieldFormat ? ' [KEY removed ✓]' : '';
+          console.log(`✅ SUCCESS (wrote "${defaultKey}", read "${readKey}"${removedMsg})`);
+          results.push({ format: defaultName, ext, success: true, key: defaultKey });
+        }
+      } catch (err) {
+        console.log(`❌ FAILED (${err.message})`);
+        results.push({ format: defaultName, ext, success: false, key: defaultKey, error: err.message });
       }
     }
 
@@ -6,18 +6,30 @@ Tests that openkeyscan-tagger can read files written in lexicon-tagger format,
 and that lexicon-tagger format files are correctly handled.
 
 This ensures full compatibility between the two tools.
+
+Run with pytest (each format is a separate test, spread over CPUs by xdist):
+    python3 -m pytest -n auto test_lexicon_compatibility.py --test-files-dir ./test-files
 """
 
 import sys
 import os
+import ctypes
 import tempfile
 import shutil
+import importlib.util
+from contextlib import contextmanager
+from io import BytesIO
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+
+if __name__ == '__main__':
+    # Run as a script: conftest.py (which puts the tagger on sys.path) isn't loaded yet
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openkeyscan_tagger import read_key_from_file, read_key_from_stream, write_key_to_file
 
-from openkeyscan_tagger import read_key_from_file, write_key_to_file
+from scratch import tmpfs_dir
 
 # Import mutagen for simulating lexicon-tagger writes
 from mutagen.id3 import ID3, TKEY, ID3NoHeaderError
@@ -25,360 +37,356 @@ from mutagen.mp4 import MP4, MP4FreeForm
 from mutagen.flac import FLAC
 from mutagen.oggvorbis import OggVorbis
 
+# Optional: tinytag reads just the tag header, so it verifies faster than mutagen
+try:
+    from tinytag import TinyTag, TinyTagException
+except ImportError:
+    TinyTag = None
+
+
+@pytest.fixture(scope="session")
+def scratch_dir():
+    """Per-worker directory for test file copies, on tmpfs (/dev/shm) where available."""
+    with tempfile.TemporaryDirectory(prefix='openkeyscan-test-', dir=tmpfs_dir()) as path:
+        yield Path(path)
+
+
+def _load_clonefile():
+    """Bind clonefile(2) from libSystem on macOS; None elsewhere."""
+    if sys.platform != 'darwin':
+        return None
+    try:
+        clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
 
-class TestResults:
-    def __init__(self):
-        self.passed = 0
-        self.failed = 0
-        self.tests = []
-
-    def add_pass(self, test_name, message=""):
-        self.passed += 1
-        self.tests.append({'name': test_name, 'status': 'PASS', 'message': message})
-        print(f"✅ PASS: {test_name}")
-        if message:
-            print(f"   {message}")
-
-    def add_fail(self, test_name, message=""):
-        self.failed += 1
-        self.tests.append({'name': test_name, 'status': 'FAIL', 'message': message})
-        print(f"❌ FAIL: {test_name}")
-        if message:
-            print(f"   {message}")
-
-    def summary(self):
-        total = self.passed + self.failed
-        print("\n" + "=" * 60)
-        print("Test Summary")
-        print("=" * 60)
-        print(f"Total: {total} tests")
-        print(f"Passed: {self.passed} ✅")
-        print(f"Failed: {self.failed} ❌")
-        print(f"Success Rate: {(self.passed / total * 100) if total > 0 else 0:.1f}%\n")
-
-        if self.failed > 0:
-            print("Failed tests:")
-            for test in self.tests:
-                if test['status'] == 'FAIL':
-                    print(f"  • {test['name']}: {test['message']}")
-            print()
-
-        return self.failed == 0
-
-
-def copy_test_file(test_files_dir, ext):
-    """Copy a test file to a temporary location."""
+_clonefile = _load_clonefile()
+
+
+def _fast_clone(src, dst):
+    """
+    Copy src to the new file dst as cheaply as the platform allows.
+
+    Uses clonefile(2) on macOS (an instant copy-on-write clone on APFS) and
+    copy_file_range(2) on Linux (a reflink on Btrfs/XFS), falling back to
+    shutil.copyfile where those are unavailable or fail.
+    """
+    if _clonefile is not None:
+        if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return
+    elif hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+            if not remaining:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+@contextmanager
+def scratch_copy(src, dst):
+    """Copy src to dst for the duration of the block, removing dst afterwards."""
+    _fast_clone(src, dst)
+    try:
+        yield dst
+    finally:
+        dst.unlink(missing_ok=True)
+
+
+@pytest.fixture
+def temp_file(test_files_dir, scratch_dir, ext):
+    """Copy of the test file for the parametrized extension, removed afterwards."""
     src = Path(test_files_dir) / f"test.{ext}"
     if not src.exists():
-        return None
+        pytest.skip(f"test.{ext} not found in {test_files_dir}")
+
+    with scratch_copy(src, scratch_dir / f"test.{ext}") as path:
+        yield path
+
 
-    fd, temp_path = tempfile.mkstemp(suffix=f".{ext}")
-    os.close(fd)
-    shutil.copy(src, temp_path)
-    return Path(temp_path)
+# Tag parser per extension for the in-memory templates
+TEMPLATE_PARSERS = {
+    'mp3': ID3,
+    'flac': FLAC,
+    'ogg': OggVorbis,
+    'mp4': MP4,
+    'm4a': MP4,
+}
 
+# Test file contents, loaded once per worker process
+_templates = {}
 
-def simulate_lexicon_tagger_write_mp3(file_path, key_value):
+
+def _load_template(test_files_dir, ext):
+    """Return the bytes of test.<ext>, reading the file on first use."""
+    src = Path(test_files_dir) / f"test.{ext}"
+    if src not in _templates:
+        if not src.exists():
+            pytest.skip(f"test.{ext} not found in {test_files_dir}")
+        _templates[src] = src.read_bytes()
+    return _templates[src]
+
+
+@pytest.fixture
+def audio_stream(test_files_dir, ext):
+    """In-memory copy of the test file for the parametrized extension."""
+    return BytesIO(_load_template(test_files_dir, ext))
+
+
+@pytest.fixture
+def template_audio(test_files_dir, ext):
+    """Freshly parsed tags of the test file, ready to mutate and save.
+
+    Parsed from the cached bytes rather than deep-copied from one parse:
+    mutagen objects don't all survive copy.deepcopy (FLAC CUESHEET tracks).
+    """
+    return TEMPLATE_PARSERS[ext](BytesIO(_load_template(test_files_dir, ext)))
+
+
+def _has_id3_header(stream):
+    """Check for an ID3v2 header with a 3-byte read, instead of catching ID3NoHeaderError."""
+    stream.seek(0)
+    return stream.read(3) == b'ID3'
+
+
+def simulate_lexicon_tagger_write_mp3(stream, key_value, audio=None):
     """Simulate how lexicon-tagger writes MP3 files (TKEY frame)."""
-    try:
-        audio = ID3(file_path)
-    except ID3NoHeaderError:
-        audio = ID3()
+    if audio is None:
+        has_tag = _has_id3_header(stream)
+        stream.seek(0)
+        audio = ID3(stream) if has_tag else ID3()
 
     audio.delall('TKEY')
     audio.add(TKEY(encoding=3, text=key_value))
-    audio.save(file_path, v2_version=4)
+    stream.seek(0)
+    audio.save(stream, v2_version=4)
 
 
-def simulate_lexicon_tagger_write_flac(file_path, key_value):
-    """Simulate how lexicon-tagger writes FLAC files (initialkey field)."""
-    audio = FLAC(file_path)
+def _write_vorbis_like(audio, key_value):
+    """Set 'initialkey' on Vorbis comments; lexicon-tagger does NOT write 'KEY', so drop it."""
     audio['initialkey'] = key_value
-    # lexicon-tagger does NOT write 'KEY' field, only 'initialkey'
-    if 'KEY' in audio:
-        del audio['KEY']
-    audio.save()
+    audio.pop('KEY', None)
 
 
-def simulate_lexicon_tagger_write_ogg(file_path, key_value):
-    """Simulate how lexicon-tagger writes OGG files (initialkey field)."""
-    audio = OggVorbis(file_path)
-    audio['initialkey'] = key_value
-    # lexicon-tagger does NOT write 'KEY' field, only 'initialkey'
-    if 'KEY' in audio:
-        del audio['KEY']
-    audio.save()
+def _write_mp4_like(audio, key_value):
+    """Set the 'initialkey' freeform tag (lowercase, not 'KEY') and drop any 'KEY' tag."""
+    # Test keys are Camelot/OpenKey notation, which is always ASCII
+    assert key_value.isascii(), f"non-ASCII test key: {key_value!r}"
+    audio['----:com.apple.iTunes:initialkey'] = MP4FreeForm(key_value.encode("ascii"))
+    audio.pop('----:com.apple.iTunes:KEY', None)
 
 
-def simulate_lexicon_tagger_write_mp4(file_path, key_value):
-    """Simulate how lexicon-tagger writes MP4 files (initialkey freeform tag)."""
-    audio = MP4(file_path)
-    # lexicon-tagger uses lowercase 'initialkey', not 'KEY'
-    audio['----:com.apple.iTunes:initialkey'] = MP4FreeForm(bytes(key_value, "utf-8"))
-    # Remove 'KEY' field if present
-    if '----:com.apple.iTunes:KEY' in audio:
-        del audio['----:com.apple.iTunes:KEY']
-    audio.save()
+def simulate_lexicon_tagger_write_flac(stream, key_value, audio=None):
+    """Simulate how lexicon-tagger writes FLAC files (initialkey field)."""
+    if audio is None:
+        stream.seek(0)
+        audio = FLAC(stream)
+    _write_vorbis_like(audio, key_value)
+    stream.seek(0)
+    audio.save(stream)
+
 
+def simulate_lexicon_tagger_write_ogg(stream, key_value, audio=None):
+    """Simulate how lexicon-tagger writes OGG files (initialkey field)."""
+    if audio is None:
+        stream.seek(0)
+        audio = OggVorbis(stream)
+    _write_vorbis_like(audio, key_value)
+    stream.seek(0)
+    audio.save(stream)
 
-def test_read_lexicon_format_files(results, test_files_dir):
-    """Test reading files written in lexicon-tagger format."""
-    print("\n" + "=" * 60)
-    print("Read Files Written in lexicon-tagger Format")
-    print("=" * 60 + "\n")
 
+def simulate_lexicon_tagger_write_mp4(stream, key_value, audio=None):
+    """Simulate how lexicon-tagger writes MP4 files (initialkey freeform tag)."""
+    if audio is None:
+        stream.seek(0)
+        audio = MP4(stream)
+    _write_mp4_like(audio, key_value)
+    stream.seek(0)
+    audio.save(stream)
+
+
+# (extension, display name, lexicon-tagger write simulation, field it writes)
+READ_MATRIX = [
+    ('mp3', 'MP3', simulate_lexicon_tagger_write_mp3, 'TKEY'),
+    ('flac', 'FLAC', simulate_lexicon_tagger_write_flac, 'initialkey'),
+    ('ogg', 'OGG', simulate_lexicon_tagger_write_ogg, 'initialkey'),
+    ('mp4', 'MP4', simulate_lexicon_tagger_write_mp4, 'initialkey'),
+    ('m4a', 'M4A', simulate_lexicon_tagger_write_mp4, 'initialkey'),
+]
+
+
+@pytest.mark.parametrize("ext,name,lexicon_write_func,field", READ_MATRIX)
+def test_read_lexicon_format_files(audio_stream, template_audio, ext, name, lexicon_write_func, field):
+    """Test reading files written in lexicon-tagger format (in memory, no disk round-trip)."""
     test_key = "11A"
 
-    # Test MP3 (TKEY - same format)
-    temp_file = copy_test_file(test_files_dir, 'mp3')
-    if temp_file:
-        try:
-            simulate_lexicon_tagger_write_mp3(temp_file, test_key)
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-
-            if success and key_value == test_key:
-                results.add_pass("Read lexicon-tagger MP3",
-                               f"Successfully read TKEY '{key_value}'")
-            else:
-                results.add_fail("Read lexicon-tagger MP3",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test FLAC (initialkey only)
-    temp_file = copy_test_file(test_files_dir, 'flac')
-    if temp_file:
-        try:
-            simulate_lexicon_tagger_write_flac(temp_file, test_key)
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-
-            if success and key_value == test_key:
-                results.add_pass("Read lexicon-tagger FLAC",
-                               f"Successfully read initialkey '{key_value}'")
-            else:
-                results.add_fail("Read lexicon-tagger FLAC",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test OGG (initialkey only)
-    temp_file = copy_test_file(test_files_dir, 'ogg')
-    if temp_file:
-        try:
-            simulate_lexicon_tagger_write_ogg(temp_file, test_key)
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-
-            if success and key_value == test_key:
-                results.add_pass("Read lexicon-tagger OGG",
-                               f"Successfully read initialkey '{key_value}'")
-            else:
-                results.add_fail("Read lexicon-tagger OGG",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test MP4 (initialkey freeform tag)
-    temp_file = copy_test_file(test_files_dir, 'mp4')
-    if temp_file:
-        try:
-            simulate_lexicon_tagger_write_mp4(temp_file, test_key)
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-
-            if success and key_value == test_key:
-                results.add_pass("Read lexicon-tagger MP4",
-                               f"Successfully read initialkey '{key_value}'")
-            else:
-                results.add_fail("Read lexicon-tagger MP4",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test M4A (initialkey freeform tag)
-    temp_file = copy_test_file(test_files_dir, 'm4a')
-    if temp_file:
-        try:
-            simulate_lexicon_tagger_write_mp4(temp_file, test_key)
-            success, key_value, fmt, error = read_key_from_file(temp_file)
+    lexicon_write_func(audio_stream, test_key, audio=template_audio)
+    success, key_value, fmt, error, *_ = read_key_from_stream(audio_stream, f".{ext}")
 
-            if success and key_value == test_key:
-                results.add_pass("Read lexicon-tagger M4A",
-                               f"Successfully read initialkey '{key_value}'")
-            else:
-                results.add_fail("Read lexicon-tagger M4A",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
+    assert success and key_value == test_key, \
+        f"Read lexicon-tagger {name} ({field}): expected '{test_key}', got '{key_value}' (error: {error})"
 
 
-def verify_lexicon_can_read_format(file_path, expected_key):
-    """
-    Verify that a file written by openkeyscan-tagger has fields that lexicon-tagger can read.
+def _verify_mp3(file_path, expected_key):
+    """lexicon-tagger reads TKEY (same as openkeyscan-tagger)."""
+    try:
+        audio = ID3(file_path)
+    except (ID3NoHeaderError, OSError):
+        return False
+    if 'TKEY' in audio:
+        key = str(audio['TKEY'].text[0]) if audio['TKEY'].text else None
+        return key == expected_key
+    return False
 
-    Since we can't actually run lexicon-tagger, we simulate by checking for the presence
-    of the 'initialkey' field that lexicon-tagger expects.
-    """
-    file_ext = file_path.suffix.lower()
 
-    if file_ext == '.mp3':
-        # lexicon-tagger reads TKEY (same as openkeyscan-tagger)
-        try:
-            audio = ID3(file_path)
-            if 'TKEY' in audio:
-                key = str(audio['TKEY'].text[0]) if audio['TKEY'].text else None
-                return key == expected_key
-        except:
-            return False
-
-    elif file_ext == '.flac':
-        # lexicon-tagger reads 'initialkey'
-        audio = FLAC(file_path)
-        if 'initialkey' in audio:
-            key = audio['initialkey'][0] if audio['initialkey'] else None
-            return key == expected_key
-        return False
+def _verify_tinytag(file_path, expected_key):
+    """
+    Check the 'initialkey' field with tinytag, if it is installed.
 
-    elif file_ext == '.ogg':
-        # lexicon-tagger reads 'initialkey'
-        audio = OggVorbis(file_path)
-        if 'initialkey' in audio:
-            key = audio['initialkey'][0] if audio['initialkey'] else None
-            return key == expected_key
-        return False
+    Returns:
+        bool or None: Whether the key matches, None if tinytag is unavailable
+            or can't parse the file (use mutagen instead)
+    """
+    if TinyTag is None:
+        return None
+    try:
+        tag = TinyTag.get(file_path, duration=False)
+    except TinyTagException:
+        return None
+    values = tag.other.get('initial_key')
+    return bool(values) and values[0] == expected_key
 
-    elif file_ext in ['.mp4', '.m4a']:
-        # lexicon-tagger reads '----:com.apple.iTunes:initialkey'
-        audio = MP4(file_path)
-        if '----:com.apple.iTunes:initialkey' in audio:
-            key_bytes = audio['----:com.apple.iTunes:initialkey'][0]
-            key = key_bytes.decode('utf-8') if isinstance(key_bytes, bytes) else str(key_bytes)
-            return key == expected_key
-        return False
 
+def _verify_vorbis(audio, expected_key):
+    """lexicon-tagger reads 'initialkey' from Vorbis comments."""
+    if 'initialkey' in audio:
+        key = audio['initialkey'][0] if audio['initialkey'] else None
+        return key == expected_key
     return False
 
 
-def test_write_compatible_with_lexicon(results, test_files_dir):
-    """Test that files written by openkeyscan-tagger can be read by lexicon-tagger."""
-    print("\n" + "=" * 60)
-    print("Verify openkeyscan-tagger Writes Are lexicon-tagger Compatible")
-    print("=" * 60 + "\n")
+def _verify_flac(file_path, expected_key):
+    verified = _verify_tinytag(file_path, expected_key)
+    if verified is not None:
+        return verified
+    return _verify_vorbis(FLAC(file_path), expected_key)
 
-    test_key = "4B"
 
-    formats = [
-        ('mp3', 'MP3'),
-        ('flac', 'FLAC'),
-        ('ogg', 'OGG'),
-        ('mp4', 'MP4'),
-        ('m4a', 'M4A')
-    ]
+def _verify_ogg(file_path, expected_key):
+    verified = _verify_tinytag(file_path, expected_key)
+    if verified is not None:
+        return verified
+    return _verify_vorbis(OggVorbis(file_path), expected_key)
 
-    for ext, name in formats:
-        temp_file = copy_test_file(test_files_dir, ext)
-        if not temp_file:
-            print(f"⚠️  SKIP: {name} (test file not found)")
-            continue
 
-        try:
-            # Write using openkeyscan-tagger
-            success, error, fmt = write_key_to_file(temp_file, test_key)
-            if not success:
-                results.add_fail(f"Write {name} for lexicon",
-                               f"Write failed: {error}")
-                continue
-
-            # Verify lexicon-tagger can read it (by checking for initialkey field)
-            can_read = verify_lexicon_can_read_format(temp_file, test_key)
+def _verify_mp4(file_path, expected_key):
+    """lexicon-tagger reads '----:com.apple.iTunes:initialkey'."""
+    verified = _verify_tinytag(file_path, expected_key)
+    if verified is not None:
+        return verified
+    audio = MP4(file_path)
+    if '----:com.apple.iTunes:initialkey' in audio:
+        key_bytes = audio['----:com.apple.iTunes:initialkey'][0]
+        key = key_bytes.decode('utf-8') if isinstance(key_bytes, bytes) else str(key_bytes)
+        return key == expected_key
+    return False
 
-            if can_read:
-                results.add_pass(f"Write {name} for lexicon",
-                               f"File has 'initialkey' field readable by lexicon-tagger")
-            else:
-                results.add_fail(f"Write {name} for lexicon",
-                               "Missing 'initialkey' field for lexicon-tagger compatibility")
 
-        finally:
-            temp_file.unlink()
+def _verify_unsupported(file_path, expected_key):
+    return False
 
 
-def test_bidirectional_compatibility(results, test_files_dir):
-    """Test bidirectional compatibility: lexicon-tagger → openkeyscan-tagger → lexicon-tagger."""
-    print("\n" + "=" * 60)
-    print("Bidirectional Compatibility Tests")
-    print("=" * 60 + "\n")
+# Extension -> lexicon-tagger read check
+_VERIFY_DISPATCH = {
+    '.mp3': _verify_mp3,
+    '.flac': _verify_flac,
+    '.ogg': _verify_ogg,
+    '.mp4': _verify_mp4,
+    '.m4a': _verify_mp4,
+}
 
-    test_key_1 = "6A"
-    test_key_2 = "9B"
 
-    formats = [
-        ('flac', 'FLAC', simulate_lexicon_tagger_write_flac),
-        ('ogg', 'OGG', simulate_lexicon_tagger_write_ogg),
-        ('mp4', 'MP4', simulate_lexicon_tagger_write_mp4)
-    ]
+def verify_lexicon_can_read_format(file_path, expected_key):
+    """
+    Verify that a file written by openkeyscan-tagger has fields that lexicon-tagger can read.
 
-    for ext, name, lexicon_write_func in formats:
-        temp_file = copy_test_file(test_files_dir, ext)
-        if not temp_file:
-            continue
+    Since we can't actually run lexicon-tagger, we simulate by parsing the file on disk
+    and checking for the field lexicon-tagger expects (TKEY for MP3, 'initialkey' elsewhere).
+    """
+    file_ext = file_path.suffix.lower()
+    return _VERIFY_DISPATCH.get(file_ext, _verify_unsupported)(file_path, expected_key)
 
-        try:
-            # Step 1: Write using lexicon-tagger format
-            lexicon_write_func(temp_file, test_key_1)
 
-            # Step 2: Read using openkeyscan-tagger
-            success, read_key_1, fmt, error = read_key_from_file(temp_file)
-            if not success or read_key_1 != test_key_1:
-                results.add_fail(f"Bidirectional {name}",
-                               f"Failed to read lexicon format: expected '{test_key_1}', got '{read_key_1}'")
-                continue
+@pytest.mark.parametrize("ext,name", [
+    ('mp3', 'MP3'),
+    ('flac', 'FLAC'),
+    ('ogg', 'OGG'),
+    ('mp4', 'MP4'),
+    ('m4a', 'M4A')
+])
+def test_write_compatible_with_lexicon(temp_file, ext, name):
+    """Test that files written by openkeyscan-tagger can be read by lexicon-tagger."""
+    test_key = "4B"
 
-            # Step 3: Write a different key using openkeyscan-tagger
-            success, error, fmt = write_key_to_file(temp_file, test_key_2)
-            if not success:
-                results.add_fail(f"Bidirectional {name}",
-                               f"Failed to write with openkeyscan: {error}")
-                continue
+    # Write using openkeyscan-tagger
+    success, error, fmt = write_key_to_file(temp_file, test_key)
+    assert success, f"Write {name} for lexicon: write failed: {error}"
 
-            # Step 4: Verify lexicon-tagger can read the new value
-            can_read = verify_lexicon_can_read_format(temp_file, test_key_2)
+    # Verify lexicon-tagger can read it (by checking the file for its field)
+    assert verify_lexicon_can_read_format(temp_file, test_key), \
+        f"Write {name} for lexicon: missing 'initialkey' field for lexicon-tagger compatibility"
 
-            if can_read:
-                results.add_pass(f"Bidirectional {name}",
-                               f"lexicon→openkeyscan→lexicon: '{test_key_1}' → '{test_key_2}' ✓")
-            else:
-                results.add_fail(f"Bidirectional {name}",
-                               "lexicon-tagger cannot read file after openkeyscan write")
 
-        finally:
-            temp_file.unlink()
+# Bidirectional rows reuse READ_MATRIX, so each write simulation is bound in one table
+BIDIRECTIONAL_MATRIX = [(ext, name, write_func) for ext, name, write_func, _ in READ_MATRIX
+                        if ext in ('flac', 'ogg', 'mp4')]
 
 
-def main():
-    """Run all compatibility tests."""
-    print("═" * 60)
-    print("  lexicon-tagger Cross-Compatibility Test Suite")
-    print("═" * 60)
+@pytest.mark.parametrize("ext,name,lexicon_write_func", BIDIRECTIONAL_MATRIX)
+def test_bidirectional_compatibility(temp_file, ext, name, lexicon_write_func):
+    """Test bidirectional compatibility: lexicon-tagger → openkeyscan-tagger → lexicon-tagger."""
+    test_key_1 = "6A"
+    test_key_2 = "9B"
 
-    test_files_dir = sys.argv[1] if len(sys.argv) > 1 else './test-files'
-    test_files_dir = Path(test_files_dir)
+    # Step 1: Write using lexicon-tagger format
+    with open(temp_file, 'r+b') as f:
+        lexicon_write_func(f, test_key_1)
 
-    if not test_files_dir.exists():
-        print(f"\n❌ Test files directory not found: {test_files_dir}")
-        print("Please create test files first.\n")
-        sys.exit(1)
+    # Step 2: Read using openkeyscan-tagger
+    success, read_key_1, fmt, error, *_ = read_key_from_file(temp_file)
+    assert success and read_key_1 == test_key_1, \
+        f"Bidirectional {name}: failed to read lexicon format: expected '{test_key_1}', got '{read_key_1}'"
 
-    print(f"\nTest files directory: {test_files_dir}\n")
+    # Step 3: Write a different key using openkeyscan-tagger
+    success, error, fmt = write_key_to_file(temp_file, test_key_2)
+    assert success, f"Bidirectional {name}: failed to write with openkeyscan: {error}"
 
-    results = TestResults()
+    # Step 4: Verify lexicon-tagger can read the new value from the file
+    assert verify_lexicon_can_read_format(temp_file, test_key_2), \
+        f"Bidirectional {name}: lexicon-tagger cannot read file after openkeyscan write"
 
-    # Run all test suites
-    test_read_lexicon_format_files(results, test_files_dir)
-    test_write_compatible_with_lexicon(results, test_files_dir)
-    test_bidirectional_compatibility(results, test_files_dir)
 
-    # Print summary
-    success = results.summary()
-    sys.exit(0 if success else 1)
+def main():
+    """Run all compatibility tests through pytest."""
+    test_files_dir = sys.argv[1] if len(sys.argv) > 1 else './test-files'
+    args = [__file__, '--test-files-dir', test_files_dir]
+    # Spread the tests over worker processes when pytest-xdist is installed,
+    # leaving two cores free for the OS and the parent process
+    if importlib.util.find_spec('xdist') is not None:
+        args += ['-n', str(max(1, (os.cpu_count() or 1) - 2))]
+    sys.exit(pytest.main(args))
 
 
 if __name__ == '__main__':
@@ -12,17 +12,27 @@ Tests:
 
 import sys
 import os
+import functools
 import tempfile
 import shutil
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, suppress
 from pathlib import Path
 
 # Add parent directory to path to import openkeyscan_tagger
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from openkeyscan_tagger import read_key_from_file, write_key_to_file
+from openkeyscan_tagger import (
+    read_key_from_file, write_key_to_file, read_key_from_audio, set_key_on_audio
+)
+
+from scratch import tmpfs_dir
 
 # Import mutagen for manual tag manipulation in tests
-from mutagen.id3 import ID3, TKEY, ID3NoHeaderError
+import mutagen.id3
+from mutagen.id3 import ID3, ID3NoHeaderError
 from mutagen.mp4 import MP4
 from mutagen.flac import FLAC
 from mutagen.oggvorbis import OggVorbis
@@ -30,364 +40,479 @@ from mutagen.aiff import AIFF
 from mutagen.wave import WAVE
 
 
+# One test outcome; a tuple is smaller and cheaper to build than a dict per test
+TestRecord = namedtuple('TestRecord', 'name status message')
+
+
 class TestResults:
-    def __init__(self):
+    """Collects test results; output is buffered and written once by flush().
+
+    With OKS_VERBOSE=1 in the environment each line is written as it is
+    logged instead, for live progress.
+    """
+
+    def __init__(self, verbose=None):
         self.passed = 0
         self.failed = 0
         self.tests = []
+        self.failed_tests = []
+        self.output = []
+        self.verbose = os.environ.get('OKS_VERBOSE') == '1' if verbose is None else verbose
+
+    def log(self, text=""):
+        """Queue a line of output (or write it right away when verbose)."""
+        self.output.append(text + "\n")
+        if self.verbose:
+            self.flush()
+
+    def section(self, title):
+        """Queue a section header."""
+        self.log("\n" + "=" * 60)
+        self.log(title)
+        self.log("=" * 60 + "\n")
+
+    def flush(self):
+        """Write all queued output to stdout in one call."""
+        sys.stdout.write("".join(self.output))
+        sys.stdout.flush()
+        self.output.clear()
+
+    def merge(self, other):
+        """Append another TestResults' outcomes and queued output to this one."""
+        self.passed += other.passed
+        self.failed += other.failed
+        self.tests.extend(other.tests)
+        self.failed_tests.extend(other.failed_tests)
+        self.output.extend(other.output)
+        if self.verbose:
+            self.flush()
 
     def add_pass(self, test_name, message=""):
         self.passed += 1
-        self.tests.append({'name': test_name, 'status': 'PASS', 'message': message})
-        print(f"✅ PASS: {test_name}")
+        self.tests.append(TestRecord(test_name, 'PASS', message))
+        self.log(f"✅ PASS: {test_name}")
         if message:
-            print(f"   {message}")
+            self.log(f"   {message}")
 
     def add_fail(self, test_name, message=""):
         self.failed += 1
-        self.tests.append({'name': test_name, 'status': 'FAIL', 'message': message})
-        print(f"❌ FAIL: {test_name}")
+        record = TestRecord(test_name, 'FAIL', message)
+        self.tests.append(record)
+        self.failed_tests.append(record)
+        self.log(f"❌ FAIL: {test_name}")
         if message:
-            print(f"   {message}")
+            self.log(f"   {message}")
 
     def summary(self):
         total = self.passed + self.failed
-        print("\n" + "=" * 60)
-        print("Test Summary")
-        print("=" * 60)
-        print(f"Total: {total} tests")
-        print(f"Passed: {self.passed} ✅")
-        print(f"Failed: {self.failed} ❌")
-        print(f"Success Rate: {(self.passed / total * 100) if total > 0 else 0:.1f}%\n")
+        self.log("\n" + "=" * 60)
+        self.log("Test Summary")
+        self.log("=" * 60)
+        self.log(f"Total: {total} tests")
+        self.log(f"Passed: {self.passed} ✅")
+        self.log(f"Failed: {self.failed} ❌")
+        self.log(f"Success Rate: {(self.passed / total * 100) if total > 0 else 0:.1f}%\n")
 
         if self.failed > 0:
-            print("Failed tests:")
-            for test in self.tests:
-                if test['status'] == 'FAIL':
-                    print(f"  • {test['name']}: {test['message']}")
-            print()
+            self.log("Failed tests:")
+            for test in self.failed_tests:
+                self.log(f"  • {test.name}: {test.message}")
+            self.log()
 
+        self.flush()
         return self.failed == 0
 
 
-def copy_test_file(test_files_dir, ext):
-    """Copy a test file to a temporary location for manipulation."""
-    src = Path(test_files_dir) / f"test.{ext}"
-    if not src.exists():
-        return None
+# Directory for the fixtures and per-test copies, set by run_suite(); None uses the
+# system default temp directory
+_TEMP_DIR = None
+
 
-    # Create temp file
-    fd, temp_path = tempfile.mkstemp(suffix=f".{ext}")
-    os.close(fd)
-    shutil.copy(src, temp_path)
-    return Path(temp_path)
+@contextmanager
+def _managed_temp_copy(test_files_dir, ext):
+    """Copy a test file to a temporary location for manipulation, removing it on exit.
 
+    Yields the copy's path as a str, or None if the test file doesn't exist.
+    """
+    src = os.path.join(test_files_dir, f"test.{ext}")
+    if not os.path.exists(src):
+        yield None
+        return
 
-def test_read_after_write(results, test_files_dir):
-    """Test reading keys after writing them (round-trip test)."""
-    print("\n" + "=" * 60)
-    print("Round-Trip Tests (Write → Read)")
-    print("=" * 60 + "\n")
+    # Create temp file; copyfile copies just the bytes (no copystat) through
+    # the kernel's fast-copy path where available
+    with tempfile.NamedTemporaryFile(suffix=f".{ext}", dir=_TEMP_DIR, delete=False) as temp:
+        temp_path = temp.name
+    try:
+        shutil.copyfile(src, temp_path)
+        yield temp_path
+    finally:
+        with suppress(FileNotFoundError):
+            os.unlink(temp_path)
 
-    test_key = "5A"
-    formats = ['mp3', 'mp4', 'm4a', 'aac', 'flac', 'ogg', 'aiff', 'aif', 'wav']
 
-    for ext in formats:
-        temp_file = copy_test_file(test_files_dir, ext)
-        if not temp_file:
-            print(f"⚠️  SKIP: {ext.upper()} (test file not found)")
+def temp_copies(stack, test_files_dir):
+    """Return copy_test_file(ext) for a suite; its copies are removed when stack closes."""
+    return lambda ext: stack.enter_context(_managed_temp_copy(test_files_dir, ext))
+
+
+@functools.lru_cache(maxsize=64)
+def _load_cached(cls, path, mtime_ns, size):
+    return cls(path)
+
+
+def _load(cls, path):
+    """Parse path with the mutagen class cls, reusing an earlier parse of the same file.
+
+    The (mtime, size) part of the cache key does not catch every change: a
+    write that keeps the size and lands in the same mtime tick keeps the key.
+    Reuse is safe only because every change made through _load is a save of
+    the object returned here (so the cached object matches the file), and
+    because fixture_file() and run_suite() call _load_cached.cache_clear()
+    wherever the file may have been written some other way. Anything that
+    writes a file outside _load (e.g. write_key_to_file) must clear the
+    cache before the next _load of that file.
+    """
+    st = os.stat(path)
+    return _load_cached(cls, os.fspath(path), st.st_mtime_ns, st.st_size)
+
+
+# One shared working copy per extension, made once per suite and reset between tests
+_FIXTURES = {}
+
+# Padding reserved when a tag block has to grow. Saves keep any padding they
+# can fit in and are patched in place; only an overflowing block is rewritten,
+# and then with room for the following saves, so each fixture is moved at
+# most once however many times the suites retag it
+_MIN_PADDING = 4096
+
+
+def _reserve_padding(info):
+    """Mutagen padding callback: keep existing padding, grow by _MIN_PADDING when it runs out."""
+    return info.padding if info.padding >= 0 else _MIN_PADDING
+
+
+def _set_id3_fields(audio, fields):
+    """Set (value) or remove (None) ID3 text frames, named by frame ID (e.g. 'TKEY'), then save."""
+    for field, value in fields.items():
+        audio.delall(field)
+        if value is not None:
+            audio.add(getattr(mutagen.id3, field)(encoding=3, text=value))
+    audio.save(padding=_reserve_padding)
+
+
+def _set_vorbis_fields(audio, fields):
+    """Set (value) or remove (None) Vorbis comment fields, then save."""
+    for field, value in fields.items():
+        if value is not None:
+            audio[field] = value
+        elif field in audio:
+            del audio[field]
+    audio.save(padding=_reserve_padding)
+
+
+def _set_mp4_fields(audio, fields):
+    """Set (value) or remove (None) iTunes freeform atoms, then save."""
+    for field, value in fields.items():
+        if value is not None:
+            audio[field] = value.encode('utf-8')
+        elif field in audio:
+            del audio[field]
+    audio.save(padding=_reserve_padding)
+
+
+# Extensions each suite runs over, in report order
+FORMATS_ROUNDTRIP = ('mp3', 'mp4', 'm4a', 'aac', 'flac', 'ogg', 'aiff', 'aif', 'wav')
+FORMATS_FIELDS = ('flac', 'ogg', 'mp4', 'm4a')
+FORMATS_NOKEY = ('mp3', 'flac', 'ogg', 'mp4')
+
+# Extension -> (mutagen class, key field, legacy key field or None, field setter),
+# shared by the fixture reset and the key-field suites
+FORMAT_DISPATCH = {
+    'mp3': (ID3, 'TKEY', None, _set_id3_fields),
+    'flac': (FLAC, 'initialkey', 'KEY', _set_vorbis_fields),
+    'ogg': (OggVorbis, 'initialkey', 'KEY', _set_vorbis_fields),
+    'mp4': (MP4, '----:com.apple.iTunes:initialkey', '----:com.apple.iTunes:KEY', _set_mp4_fields),
+    'm4a': (MP4, '----:com.apple.iTunes:initialkey', '----:com.apple.iTunes:KEY', _set_mp4_fields),
+}
+
+
+def setup_fixtures(test_files_dir, fixtures_dir):
+    """Copy each test file once into fixtures_dir and register it (as a str path) in _FIXTURES."""
+    for src in sorted(Path(test_files_dir).glob('test.*')):
+        dst = os.path.join(fixtures_dir, src.name)
+        shutil.copyfile(src, dst)
+        # Mutagen and the tagger take str paths as is; no fspath() per call
+        _FIXTURES[src.suffix[1:].lower()] = dst
+
+
+def reset_tags(path, ext):
+    """Remove all key fields (TKEY, or initialkey/KEY in any case) from a fixture and save it."""
+    try:
+        audio = _load(FORMAT_DISPATCH[ext][0], path)
+    except ID3NoHeaderError:
+        return  # no ID3 tag, so no TKEY either
+
+    if ext == 'mp3':
+        audio.delall('TKEY')
+    elif ext in ('mp4', 'm4a'):
+        for name in [name for name in audio.keys()
+                     if name.lower() in ('----:com.apple.itunes:initialkey', '----:com.apple.itunes:key')]:
+            del audio[name]
+    else:
+        audio.pop('initialkey', None)
+        audio.pop('KEY', None)
+    audio.save(padding=_reserve_padding)
+
+
+def fixture_file(ext):
+    """Shared working copy of test.<ext> with its key fields cleared, or None if missing."""
+    path = _FIXTURES.get(ext)
+    if path is not None:
+        # The previous test may have written the file without going through _load
+        _load_cached.cache_clear()
+        reset_tags(path, ext)
+    return path
+
+
+# Read-only fixtures holding given key fields, built on first use:
+# (ext, frozenset of field items) -> path
+_VARIANTS = {}
+
+
+def variant_file(ext, tags):
+    """
+    Read-only copy of test.<ext> with its key fields cleared and then tags set, or None if missing.
+
+    Each variant is built once and shared by every test asking for the same
+    fields, so pure read checks need no copy, write or reset of their own.
+    Tests must not write to it.
+
+    Args:
+        ext (str): Fixture extension
+        tags (dict): Field name as the format stores it -> value, or None to remove it
+    """
+    variant_key = (ext, frozenset(tags.items()))
+    path = _VARIANTS.get(variant_key)
+    if path is None:
+        src = _FIXTURES.get(ext)
+        if src is None:
+            return None
+        with tempfile.NamedTemporaryFile(suffix=f".{ext}", dir=_TEMP_DIR, delete=False) as temp:
+            path = temp.name
+        shutil.copyfile(src, path)
+        reset_tags(path, ext)
+        if tags:
+            cls, _, _, setter = FORMAT_DISPATCH[ext]
+            setter(_load(cls, path), tags)
+        _VARIANTS[variant_key] = path
+    return path
+
+
+def run_jobs(results, jobs):
+    """
+    Run independent test jobs on a thread pool, then record their outcomes in order.
+
+    Each job returns a TestRecord ('PASS', 'FAIL' or 'SKIP') or None. The jobs
+    are I/O-bound (mutagen saves and re-reads), so threads overlap their file
+    I/O; results are recorded on the calling thread to keep the output ordered.
+    """
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        records = list(executor.map(lambda job: job(), jobs))
+    for record in records:
+        if record is None:
             continue
+        if record.status == 'PASS':
+            results.add_pass(record.name, record.message)
+        elif record.status == 'FAIL':
+            results.add_fail(record.name, record.message)
+        else:
+            results.log(f"⚠️  SKIP: {record.name}")
+
+
+# Extension -> mutagen class for the in-memory round trip
+_ROUNDTRIP_CLASSES = {
+    'mp3': ID3, 'aac': ID3,
+    'mp4': MP4, 'm4a': MP4,
+    'flac': FLAC, 'ogg': OggVorbis,
+    'aiff': AIFF, 'aif': AIFF, 'wav': WAVE,
+}
+
+
+def _roundtrip_in_memory(path, ext, key_value):
+    """
+    Set the key through one mutagen handle, save it, and read the key back
+    from that same object without reopening the file.
 
+    Returns:
+        str or None: The key read back
+    """
+    cls = _ROUNDTRIP_CLASSES[ext]
+    if cls is ID3:
         try:
-            # Write key
-            success, error, fmt = write_key_to_file(temp_file, test_key)
-            if not success:
-                results.add_fail(f"Round-trip {ext.upper()}", f"Write failed: {error}")
-                continue
-
-            # Read key back
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if not success:
-                results.add_fail(f"Round-trip {ext.upper()}", f"Read failed: {error}")
-            elif key_value != test_key:
-                results.add_fail(f"Round-trip {ext.upper()}",
-                                f"Expected '{test_key}', got '{key_value}'")
+            audio = ID3(path)
+        except ID3NoHeaderError:
+            audio = ID3()
+        set_key_on_audio(audio, key_value)
+        audio.save(path, v2_version=4, padding=_reserve_padding)
+    else:
+        audio = cls(path)
+        set_key_on_audio(audio, key_value)
+        audio.save(padding=_reserve_padding)
+    return read_key_from_audio(audio)[0]
+
+
+def test_read_after_write(results, test_files_dir, in_memory=False):
+    """
+    Test reading keys after writing them (round-trip test).
+
+    By default each format goes through write_key_to_file and
+    read_key_from_file, reopening the file for the read. in_memory writes
+    and reads back through a single open mutagen object instead; it is
+    quicker but does not exercise the tagger's file writers.
+    """
+    results.section("Round-Trip Tests (Write → Read)")
+
+    test_key = "5A"
+
+    with ExitStack() as stack:
+        copy_test_file = temp_copies(stack, test_files_dir)
+
+        def check(ext):
+            name = f"Round-trip {ext.upper()}"
+            temp_file = copy_test_file(ext)
+            if not temp_file:
+                return TestRecord(f"{ext.upper()} (test file not found)", 'SKIP', '')
+
+            if in_memory:
+                try:
+                    key_value = _roundtrip_in_memory(temp_file, ext, test_key)
+                except Exception as e:
+                    return TestRecord(name, 'FAIL', f"Round trip failed: {e}")
             else:
-                results.add_pass(f"Round-trip {ext.upper()}",
-                               f"Wrote '{test_key}', read '{key_value}'")
+                # Write key
+                success, error, fmt = write_key_to_file(temp_file, test_key)
+                if not success:
+                    return TestRecord(name, 'FAIL', f"Write failed: {error}")
+
+                # Read key back
+                success, key_value, fmt, error, *_ = read_key_from_file(temp_file)
+                if not success:
+                    return TestRecord(name, 'FAIL', f"Read failed: {error}")
+
+            if key_value != test_key:
+                return TestRecord(name, 'FAIL', f"Expected '{test_key}', got '{key_value}'")
+            return TestRecord(name, 'PASS', f"Wrote '{test_key}', read '{key_value}'")
+
+        run_jobs(results, [functools.partial(check, ext) for ext in FORMATS_ROUNDTRIP])
+
+
+def _run_field_test(ext, tags, expected_key, case_name, describe):
+    """
+    Check the key read back from the variant fixture for ext holding tags.
+
+    Args:
+        ext (str): Fixture extension
+        tags (dict): Field name as the format stores it -> value, or None to remove it
+        expected_key: Key read_key_from_file should return
+        case_name (str): Test name
+        describe: Function of the read key returning the pass message
+
+    Returns:
+        TestRecord, or None if the test file is missing
+    """
+    temp_file = variant_file(ext, tags)
+    if not temp_file:
+        return None
 
-        finally:
-            if temp_file.exists():
-                temp_file.unlink()
+    success, key_value, fmt, error, *_ = read_key_from_file(temp_file)
+    if success and key_value == expected_key:
+        return TestRecord(case_name, 'PASS', describe(key_value))
+    return TestRecord(case_name, 'FAIL',
+                      f"Expected '{expected_key}', got '{key_value}' (error: {error})")
+
+
+def _field_jobs(fields, expected_key, label, describe, formats=FORMATS_FIELDS):
+    """
+    Build one job per format that sets the given key fields and reads the key back.
+
+    Args:
+        fields (dict): Field name ('initialkey'/'KEY') -> value, or None to remove it
+        expected_key: Key read_key_from_file should return
+        label (str): Test name suffix, e.g. 'KEY-only read'
+        describe: Function of the read key returning the pass message
+        formats: Extensions to test
+    """
+    def check(ext):
+        _, key_field, legacy_field, _ = FORMAT_DISPATCH[ext]
+        names = {'initialkey': key_field, 'KEY': legacy_field}
+        tags = {names[field]: value for field, value in fields.items()}
+        return _run_field_test(ext, tags, expected_key, f"{ext.upper()} {label}", describe)
+
+    return [functools.partial(check, ext) for ext in formats]
 
 
 def test_read_from_initialkey_only(results, test_files_dir):
     """Test reading from 'initialkey' field when only that field is set."""
-    print("\n" + "=" * 60)
-    print("Read from 'initialkey' Only (Standard Field)")
-    print("=" * 60 + "\n")
+    results.section("Read from 'initialkey' Only (Standard Field)")
 
     test_key = "9A"
 
-    # Test FLAC
-    temp_file = copy_test_file(test_files_dir, 'flac')
-    if temp_file:
-        try:
-            audio = FLAC(temp_file)
-            # Set only initialkey, remove KEY if present
-            audio['initialkey'] = test_key
-            if 'KEY' in audio:
-                del audio['KEY']
-            audio.save()
-
-            # Read back
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("FLAC initialkey-only read", f"Read '{key_value}' from initialkey")
-            else:
-                results.add_fail("FLAC initialkey-only read",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test OGG
-    temp_file = copy_test_file(test_files_dir, 'ogg')
-    if temp_file:
-        try:
-            audio = OggVorbis(temp_file)
-            audio['initialkey'] = test_key
-            if 'KEY' in audio:
-                del audio['KEY']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("OGG initialkey-only read", f"Read '{key_value}' from initialkey")
-            else:
-                results.add_fail("OGG initialkey-only read",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test MP4/M4A
-    for ext in ['mp4', 'm4a']:
-        temp_file = copy_test_file(test_files_dir, ext)
-        if not temp_file:
-            continue
-        try:
-            audio = MP4(temp_file)
-            audio['----:com.apple.iTunes:initialkey'] = test_key.encode('utf-8')
-            if '----:com.apple.iTunes:KEY' in audio:
-                del audio['----:com.apple.iTunes:KEY']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass(f"{ext.upper()} initialkey-only read",
-                               f"Read '{key_value}' from initialkey")
-            else:
-                results.add_fail(f"{ext.upper()} initialkey-only read",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
+    # Set only initialkey, remove KEY if present
+    run_jobs(results, _field_jobs({'initialkey': test_key, 'KEY': None}, test_key,
+                                  "initialkey-only read",
+                                  lambda key_value: f"Read '{key_value}' from initialkey"))
 
 
 def test_read_from_KEY_only(results, test_files_dir):
     """Test reading from 'KEY' field when only that field is set (legacy compatibility)."""
-    print("\n" + "=" * 60)
-    print("Read from 'KEY' Only (Legacy Compatibility)")
-    print("=" * 60 + "\n")
+    results.section("Read from 'KEY' Only (Legacy Compatibility)")
 
     test_key = "3B"
 
-    # Test FLAC
-    temp_file = copy_test_file(test_files_dir, 'flac')
-    if temp_file:
-        try:
-            audio = FLAC(temp_file)
-            audio['KEY'] = test_key
-            if 'initialkey' in audio:
-                del audio['initialkey']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("FLAC KEY-only read", f"Read '{key_value}' from KEY (legacy)")
-            else:
-                results.add_fail("FLAC KEY-only read",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test OGG
-    temp_file = copy_test_file(test_files_dir, 'ogg')
-    if temp_file:
-        try:
-            audio = OggVorbis(temp_file)
-            audio['KEY'] = test_key
-            if 'initialkey' in audio:
-                del audio['initialkey']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("OGG KEY-only read", f"Read '{key_value}' from KEY (legacy)")
-            else:
-                results.add_fail("OGG KEY-only read",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test MP4/M4A
-    for ext in ['mp4', 'm4a']:
-        temp_file = copy_test_file(test_files_dir, ext)
-        if not temp_file:
-            continue
-        try:
-            audio = MP4(temp_file)
-            audio['----:com.apple.iTunes:KEY'] = test_key.encode('utf-8')
-            if '----:com.apple.iTunes:initialkey' in audio:
-                del audio['----:com.apple.iTunes:initialkey']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass(f"{ext.upper()} KEY-only read",
-                               f"Read '{key_value}' from KEY (legacy)")
-            else:
-                results.add_fail(f"{ext.upper()} KEY-only read",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
+    run_jobs(results, _field_jobs({'KEY': test_key, 'initialkey': None}, test_key,
+                                  "KEY-only read",
+                                  lambda key_value: f"Read '{key_value}' from KEY (legacy)"))
 
 
 def test_field_priority(results, test_files_dir):
     """Test that 'initialkey' is preferred over 'KEY' when both are present."""
-    print("\n" + "=" * 60)
-    print("Field Priority Tests (initialkey > KEY)")
-    print("=" * 60 + "\n")
+    results.section("Field Priority Tests (initialkey > KEY)")
 
     initialkey_value = "7A"
     KEY_value = "8B"  # Different value to test priority
 
-    # Test FLAC
-    temp_file = copy_test_file(test_files_dir, 'flac')
-    if temp_file:
-        try:
-            audio = FLAC(temp_file)
-            audio['initialkey'] = initialkey_value
-            audio['KEY'] = KEY_value
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == initialkey_value:
-                results.add_pass("FLAC field priority",
-                               f"Correctly preferred initialkey '{initialkey_value}' over KEY '{KEY_value}'")
-            else:
-                results.add_fail("FLAC field priority",
-                               f"Expected '{initialkey_value}' (initialkey), got '{key_value}'")
-        finally:
-            temp_file.unlink()
-
-    # Test OGG
-    temp_file = copy_test_file(test_files_dir, 'ogg')
-    if temp_file:
-        try:
-            audio = OggVorbis(temp_file)
-            audio['initialkey'] = initialkey_value
-            audio['KEY'] = KEY_value
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == initialkey_value:
-                results.add_pass("OGG field priority",
-                               f"Correctly preferred initialkey '{initialkey_value}' over KEY '{KEY_value}'")
-            else:
-                results.add_fail("OGG field priority",
-                               f"Expected '{initialkey_value}' (initialkey), got '{key_value}'")
-        finally:
-            temp_file.unlink()
-
-    # Test MP4
-    temp_file = copy_test_file(test_files_dir, 'mp4')
-    if temp_file:
-        try:
-            audio = MP4(temp_file)
-            audio['----:com.apple.iTunes:initialkey'] = initialkey_value.encode('utf-8')
-            audio['----:com.apple.iTunes:KEY'] = KEY_value.encode('utf-8')
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == initialkey_value:
-                results.add_pass("MP4 field priority",
-                               f"Correctly preferred initialkey '{initialkey_value}' over KEY '{KEY_value}'")
-            else:
-                results.add_fail("MP4 field priority",
-                               f"Expected '{initialkey_value}' (initialkey), got '{key_value}'")
-        finally:
-            temp_file.unlink()
+    run_jobs(results, _field_jobs({'initialkey': initialkey_value, 'KEY': KEY_value}, initialkey_value,
+                                  "field priority",
+                                  lambda key_value: f"Correctly preferred initialkey '{initialkey_value}' over KEY '{KEY_value}'",
+                                  formats=('flac', 'ogg', 'mp4')))
 
 
 def test_read_no_key(results, test_files_dir):
     """Test reading from files with no key field set."""
-    print("\n" + "=" * 60)
-    print("Read from Files with No Key")
-    print("=" * 60 + "\n")
-
-    formats = ['mp3', 'flac', 'ogg', 'mp4']
+    results.section("Read from Files with No Key")
 
-    for ext in formats:
-        temp_file = copy_test_file(test_files_dir, ext)
+    def check(ext):
+        # Variant with all key fields removed and nothing set
+        temp_file = variant_file(ext, {})
         if not temp_file:
-            continue
+            return None
 
-        try:
-            # Remove all key fields
-            if ext == 'mp3':
-                try:
-                    audio = ID3(temp_file)
-                    audio.delall('TKEY')
-                    audio.save()
-                except ID3NoHeaderError:
-                    pass
-            elif ext == 'flac':
-                audio = FLAC(temp_file)
-                if 'KEY' in audio:
-                    del audio['KEY']
-                if 'initialkey' in audio:
-                    del audio['initialkey']
-                audio.save()
-            elif ext == 'ogg':
-                audio = OggVorbis(temp_file)
-                if 'KEY' in audio:
-                    del audio['KEY']
-                if 'initialkey' in audio:
-                    del audio['initialkey']
-                audio.save()
-            elif ext == 'mp4':
-                audio = MP4(temp_file)
-                if '----:com.apple.iTunes:KEY' in audio:
-                    del audio['----:com.apple.iTunes:KEY']
-                if '----:com.apple.iTunes:initialkey' in audio:
-                    del audio['----:com.apple.iTunes:initialkey']
-                audio.save()
-
-            # Read back - should return None
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value is None:
-                results.add_pass(f"{ext.upper()} no-key read", "Correctly returned None")
-            else:
-                results.add_fail(f"{ext.upper()} no-key read",
-                               f"Expected None, got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
+        # Read back - should return None
+        success, key_value, fmt, error, *_ = read_key_from_file(temp_file)
+        if success and key_value is None:
+            return TestRecord(f"{ext.upper()} no-key read", 'PASS', "Correctly returned None")
+        return TestRecord(f"{ext.upper()} no-key read", 'FAIL',
+                          f"Expected None, got '{key_value}' (error: {error})")
+
+    run_jobs(results, [functools.partial(check, ext) for ext in FORMATS_NOKEY])
 
 
 def test_various_key_formats(results, test_files_dir):
     """Test reading various key format strings."""
-    print("\n" + "=" * 60)
-    print("Various Key Format Tests")
-    print("=" * 60 + "\n")
+    results.section("Various Key Format Tests")
 
     test_keys = [
         "1A", "12B",  # Camelot notation
@@ -397,20 +522,23 @@ def test_various_key_formats(results, test_files_dir):
         "Custom Key 123"  # Custom format
     ]
 
-    temp_file = copy_test_file(test_files_dir, 'flac')
+    temp_file = fixture_file('flac')
     if not temp_file:
-        print("⚠️  SKIP: FLAC test file not found")
+        results.log("⚠️  SKIP: FLAC test file not found")
         return
 
-    for test_key in test_keys:
+    # One FLAC object for every key: each key is saved through it and read
+    # back from it, and only the last key is read back from disk
+    audio = _load(FLAC, temp_file)
+    for i, test_key in enumerate(test_keys):
         try:
-            # Write and read
-            success, error, fmt = write_key_to_file(temp_file, test_key)
-            if not success:
-                results.add_fail(f"Key format '{test_key}'", f"Write failed: {error}")
-                continue
+            set_key_on_audio(audio, test_key)
+            audio.save(padding=_reserve_padding)
 
-            success, key_value, fmt, error = read_key_from_file(temp_file)
+            if i == len(test_keys) - 1:
+                success, key_value, fmt, error, *_ = read_key_from_file(temp_file)
+            else:
+                success, key_value = True, read_key_from_audio(audio)[0]
             if success and key_value == test_key:
                 results.add_pass(f"Key format '{test_key}'", f"Successfully round-tripped")
             else:
@@ -419,9 +547,6 @@ def test_various_key_formats(results, test_files_dir):
         except Exception as e:
             results.add_fail(f"Key format '{test_key}'", f"Exception: {str(e)}")
 
-    if temp_file.exists():
-        temp_file.unlink()
-
 
 def test_case_insensitive_field_names(results, test_files_dir):
     """Test that field name lookups are case-insensitive.
@@ -431,110 +556,103 @@ def test_case_insensitive_field_names(results, test_files_dir):
     The case-insensitive lookup is still useful for compatibility with tools
     that might read Vorbis tags differently.
     """
-    print("\n" + "=" * 60)
-    print("Case-Insensitive Field Name Tests")
-    print("=" * 60 + "\n")
+    results.section("Case-Insensitive Field Name Tests")
 
     test_key = "10A"
 
-    # Test MP4 with uppercase iTunes tag
-    temp_file = copy_test_file(test_files_dir, 'mp4')
-    if temp_file:
-        try:
-            audio = MP4(temp_file)
-            # MP4 tags preserve case, unlike Vorbis comments
-            audio['----:com.apple.iTunes:INITIALKEY'] = test_key.encode('utf-8')
-            if '----:com.apple.iTunes:initialkey' in audio:
-                del audio['----:com.apple.iTunes:initialkey']
-            if '----:com.apple.iTunes:KEY' in audio:
-                del audio['----:com.apple.iTunes:KEY']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("MP4 uppercase iTunes:INITIALKEY",
-                               f"Read '{key_value}' from uppercase iTunes tag")
-            else:
-                results.add_fail("MP4 uppercase iTunes:INITIALKEY",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test MP4 with mixed-case iTunes tag
-    temp_file = copy_test_file(test_files_dir, 'mp4')
-    if temp_file:
-        try:
-            audio = MP4(temp_file)
-            audio['----:com.apple.iTunes:InitialKey'] = test_key.encode('utf-8')
-            if '----:com.apple.iTunes:initialkey' in audio:
-                del audio['----:com.apple.iTunes:initialkey']
-            if '----:com.apple.iTunes:INITIALKEY' in audio:
-                del audio['----:com.apple.iTunes:INITIALKEY']
-            if '----:com.apple.iTunes:KEY' in audio:
-                del audio['----:com.apple.iTunes:KEY']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("MP4 mixed-case iTunes:InitialKey",
-                               f"Read '{key_value}' from mixed-case iTunes tag")
-            else:
-                results.add_fail("MP4 mixed-case iTunes:InitialKey",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
-
-    # Test MP4 with uppercase KEY tag (legacy)
-    temp_file = copy_test_file(test_files_dir, 'mp4')
-    if temp_file:
-        try:
-            audio = MP4(temp_file)
-            audio['----:com.apple.iTunes:KEY'] = test_key.encode('utf-8')
-            if '----:com.apple.iTunes:key' in audio:
-                del audio['----:com.apple.iTunes:key']
-            if '----:com.apple.iTunes:initialkey' in audio:
-                del audio['----:com.apple.iTunes:initialkey']
-            if '----:com.apple.iTunes:INITIALKEY' in audio:
-                del audio['----:com.apple.iTunes:INITIALKEY']
-            audio.save()
-
-            success, key_value, fmt, error = read_key_from_file(temp_file)
-            if success and key_value == test_key:
-                results.add_pass("MP4 uppercase iTunes:KEY (legacy)",
-                               f"Read '{key_value}' from uppercase KEY tag")
-            else:
-                results.add_fail("MP4 uppercase iTunes:KEY (legacy)",
-                               f"Expected '{test_key}', got '{key_value}' (error: {error})")
-        finally:
-            temp_file.unlink()
+    # (iTunes atom, test name, what the pass message calls it). Each variant
+    # starts with the key atoms removed in every case, so it holds only its own
+    cases = [
+        ('----:com.apple.iTunes:INITIALKEY', "MP4 uppercase iTunes:INITIALKEY", "uppercase iTunes tag"),
+        ('----:com.apple.iTunes:InitialKey', "MP4 mixed-case iTunes:InitialKey", "mixed-case iTunes tag"),
+        ('----:com.apple.iTunes:KEY', "MP4 uppercase iTunes:KEY (legacy)", "uppercase KEY tag"),
+    ]
+
+    run_jobs(results, [
+        functools.partial(_run_field_test, 'mp4', {atom: test_key}, test_key, case_name,
+                          lambda key_value, where=where: f"Read '{key_value}' from {where}")
+        for atom, case_name, where in cases
+    ])
+
+
+def run_suite(job):
+    """
+    Run one test suite on its own fixtures, in a worker process.
+
+    Each suite gets a private temp directory and fixture set, so suites that
+    write their fixtures cannot race with suites reading theirs.
+
+    Args:
+        job: (suite function, test files directory, extra keyword arguments)
+
+    Returns:
+        TestResults: The suite's outcomes, with its output queued
+    """
+    global _TEMP_DIR
+    suite, test_files_dir, kwargs = job
+    results = TestResults(verbose=False)
+
+    # Keep every working copy in one directory, on tmpfs where available so
+    # the many saves never reach the disk
+    temp_dir = tempfile.TemporaryDirectory(dir=tmpfs_dir())
+    _TEMP_DIR = temp_dir.name
+    _FIXTURES.clear()
+    _VARIANTS.clear()
+    _load_cached.cache_clear()
+    try:
+        setup_fixtures(test_files_dir, temp_dir.name)
+        suite(results, test_files_dir, **kwargs)
+    finally:
+        temp_dir.cleanup()
+    return results
 
 
 def main():
     """Run all tests."""
-    print("═" * 60)
-    print("  Read Function Comprehensive Test Suite")
-    print("═" * 60)
+    results = TestResults()
+    results.log("═" * 60)
+    results.log("  Read Function Comprehensive Test Suite")
+    results.log("═" * 60)
 
-    test_files_dir = sys.argv[1] if len(sys.argv) > 1 else './test-files'
+    # --in-memory: write/read round trips through one mutagen handle, not the file
+    args = sys.argv[1:]
+    in_memory = '--in-memory' in args
+    args = [a for a in args if a != '--in-memory']
+
+    test_files_dir = args[0] if args else './test-files'
     test_files_dir = Path(test_files_dir)
 
     if not test_files_dir.exists():
-        print(f"\n❌ Test files directory not found: {test_files_dir}")
-        print("Please create test files first.\n")
+        results.log(f"\n❌ Test files directory not found: {test_files_dir}")
+        results.log("Please create test files first.\n")
+        results.flush()
         sys.exit(1)
 
-    print(f"\nTest files directory: {test_files_dir}\n")
-
-    results = TestResults()
-
-    # Run all test suites
-    test_read_after_write(results, test_files_dir)
-    test_read_from_initialkey_only(results, test_files_dir)
-    test_read_from_KEY_only(results, test_files_dir)
-    test_field_priority(results, test_files_dir)
-    test_read_no_key(results, test_files_dir)
-    test_various_key_formats(results, test_files_dir)
-    test_case_insensitive_field_names(results, test_files_dir)
+    results.log(f"\nTest files directory: {test_files_dir}\n")
+
+    # The suites are independent: run them in parallel processes and merge
+    # their results back in this order
+    suites = [
+        (test_read_after_write, {'in_memory': in_memory}),
+        (test_read_from_initialkey_only, {}),
+        (test_read_from_KEY_only, {}),
+        (test_field_priority, {}),
+        (test_read_no_key, {}),
+        (test_various_key_formats, {}),
+        (test_case_insensitive_field_names, {}),
+    ]
+    jobs = [(suite, test_files_dir, kwargs) for suite, kwargs in suites]
+
+    # Queued output is written even if a suite crashes
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(len(jobs), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            for suite_results in executor.map(run_suite, jobs):
+                results.merge(suite_results)
+    finally:
+        results.flush()
 
     # Print summary
     success = results.summary()
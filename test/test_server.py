@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Protocol tests for the openkeyscan-tagger server
+
+Runs openkeyscan_tagger.py as a subprocess, sends it NDJSON requests on stdin
+and checks the responses it writes to stdout.
+
+Run with pytest:
+    python3 -m pytest test_server.py --test-files-dir ./test-files
+"""
+
+import sys
+import os
+import json
+import queue
+import signal
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+from mutagen.flac import FLAC
+
+if __name__ == '__main__':
+    # Run as a script: conftest.py (which puts the tagger on sys.path) isn't loaded yet
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openkeyscan_tagger import KeyTaggingServer, process_request
+
+SERVER = Path(__file__).parent.parent / 'openkeyscan_tagger.py'
+
+
+def run_server(requests, timeout=60):
+    """
+    Send requests to a fresh server and return its responses once stdin is closed.
+
+    Args:
+        requests (list): Request objects, sent one per line
+        timeout (int): Seconds to wait for the server to exit
+
+    Returns:
+        list: Response objects, without the 'ready'/'heartbeat' system messages
+    """
+    lines = ''.join(json.dumps(request) + '\n' for request in requests)
+    proc = subprocess.run([sys.executable, str(SERVER), '--workers', '1'],
+                          input=lines.encode('utf-8'), capture_output=True, timeout=timeout)
+    assert proc.returncode == 0, proc.stderr.decode('utf-8', 'replace')
+
+    responses = [json.loads(line) for line in proc.stdout.decode('utf-8').splitlines() if line.strip()]
+    return [response for response in responses if 'type' not in response]
+
+
+@pytest.fixture
+def flac_file(test_files_dir, tmp_path):
+    """Copy of test.flac, removed with tmp_path."""
+    src = Path(test_files_dir) / 'test.flac'
+    if not src.exists():
+        pytest.skip(f"test.flac not found in {test_files_dir}")
+    dst = tmp_path / 'test.flac'
+    shutil.copyfile(src, dst)
+    return dst
+
+
+def test_batch_results_in_request_order(flac_file):
+    """Entries run one after another in input order, each result at its entry's position."""
+    path = str(flac_file)
+    responses = run_server([{'id': 'b1', 'batch': [
+        {'id': 'w1', 'path': path, 'key': '4B'},
+        {'id': 'r1', 'path': path},
+        {'id': 'w2', 'path': path, 'key': '11A'},
+        {'id': 'r2', 'path': path},
+    ]}])
+
+    assert len(responses) == 1
+    batch = responses[0]
+    assert batch['id'] == 'b1'
+    assert batch['status'] == 'batch'
+    assert [result['id'] for result in batch['results']] == ['w1', 'r1', 'w2', 'r2']
+    assert [result['status'] for result in batch['results']] == ['success'] * 4
+    # Each read sees the write just before it
+    assert batch['results'][1]['key'] == '4B'
+    assert batch['results'][3]['key'] == '11A'
+
+
+def test_batch_entry_without_id(flac_file):
+    """An entry without an id is processed, and its result carries no id."""
+    responses = run_server([{'id': 'b2', 'batch': [
+        {'path': str(flac_file), 'key': '2A'},
+        {'id': 'r', 'path': str(flac_file)},
+    ]}])
+
+    results = responses[0]['results']
+    assert results[0]['status'] == 'success'
+    assert 'id' not in results[0]
+    assert results[1]['id'] == 'r'
+    assert results[1]['key'] == '2A'
+
+
+def test_batch_non_dict_entry(flac_file):
+    """A non-object entry gets an error result without failing the rest of the batch."""
+    responses = run_server([{'id': 'b3', 'batch': [
+        42,
+        'not a request',
+        {'id': 'r', 'path': str(flac_file)},
+    ]}])
+
+    results = responses[0]['results']
+    assert results[0] == {'status': 'error', 'error': 'Invalid batch entry'}
+    assert results[1] == {'status': 'error', 'error': 'Invalid batch entry'}
+    assert results[2]['id'] == 'r'
+    assert results[2]['status'] == 'success'
+
+
+def test_empty_batch():
+    """An empty batch is answered with an empty result list."""
+    responses = run_server([{'id': 'b4', 'batch': []}])
+
+    assert responses == [{'id': 'b4', 'status': 'batch', 'results': []}]
+
+
+def test_batch_not_a_list():
+    """A 'batch' that isn't a list is rejected as a whole."""
+    responses = run_server([{'id': 'b5', 'batch': {'path': '/tmp/x.flac'}}])
+
+    assert responses == [{'id': 'b5', 'status': 'error', 'error': 'Batch must be a list of requests'}]
+
+
+def test_batch_error_entry(flac_file):
+    """A failing entry is reported in place and later entries still run."""
+    responses = run_server([{'id': 'b6', 'batch': [
+        {'id': 'missing', 'path': str(flac_file.with_name('missing.flac'))},
+        {'id': 'r', 'path': str(flac_file)},
+    ]}])
+
+    results = responses[0]['results']
+    assert results[0]['id'] == 'missing'
+    assert results[0]['status'] == 'error'
+    assert results[0]['error'] == 'File not found'
+    assert results[1]['status'] == 'success'
+
+
+@pytest.fixture
+def server_io(tmp_path, monkeypatch):
+    """In-process server whose stdin/stdout are files; yields (server, stdout path)."""
+    stdout_path = tmp_path / 'stdout'
+    with open(tmp_path / 'stdin', 'wb+') as stdin, open(stdout_path, 'wb+') as stdout:
+        monkeypatch.setattr(sys, 'stdin', stdin)
+        monkeypatch.setattr(sys, 'stdout', stdout)
+        server = KeyTaggingServer(num_workers=1)
+        try:
+            yield server, stdout_path
+        finally:
+            server.executor.shutdown()
+
+
+def test_unencodable_response_is_answered(server_io):
+    """A response orjson can't encode (lone surrogate in a tag) becomes an error for its id."""
+    server, stdout_path = server_io
+
+    server.send_message({'id': 'r1', 'status': 'success', 'key': '9A', 'title': 'Bad \ud800 Title'})
+    server.send_message({'id': 'r2', 'status': 'success', 'key': '2A', 'title': 'Good Title'})
+
+    responses = [json.loads(line) for line in stdout_path.read_bytes().splitlines()]
+    assert len(responses) == 2
+    assert responses[0]['id'] == 'r1'
+    assert responses[0]['status'] == 'error'
+    assert 'surrogates' in responses[0]['error']
+    assert responses[1] == {'id': 'r2', 'status': 'success', 'key': '2A', 'title': 'Good Title'}
+
+
+def worker_pids(server_pid):
+    """Pids of the pool worker processes of a running server (Linux /proc only)."""
+    pids = []
+    for task in Path(f'/proc/{server_pid}/task').iterdir():
+        for pid in (task / 'children').read_text().split():
+            try:
+                cmdline = Path(f'/proc/{pid}/cmdline').read_bytes()
+            except FileNotFoundError:
+                continue
+            # Skip the multiprocessing resource tracker
+            if b'spawn_main' in cmdline:
+                pids.append(int(pid))
+    return pids
+
+
+@pytest.mark.skipif(not Path(f'/proc/{os.getpid()}/task/{os.getpid()}/children').exists(),
+                    reason="needs /proc/<pid>/task/<tid>/children to find the workers")
+def test_server_survives_worker_death(flac_file):
+    """A killed worker process doesn't take the server down; later requests are answered."""
+    proc = subprocess.Popen([sys.executable, str(SERVER), '--workers', '1'],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    # Read stdout on a thread so a server that stops answering fails the test instead of hanging it
+    lines = queue.Queue()
+    threading.Thread(target=lambda: [lines.put(line) for line in proc.stdout], daemon=True).start()
+
+    def next_message():
+        try:
+            return json.loads(lines.get(timeout=30))
+        except queue.Empty:
+            pytest.fail("server stopped answering")
+
+    def request(message):
+        proc.stdin.write(json.dumps(message).encode('utf-8') + b'\n')
+        proc.stdin.flush()
+        while True:
+            response = next_message()
+            if 'type' not in response:
+                return response
+
+    try:
+        assert next_message() == {'type': 'ready'}
+        assert request({'id': 'r1', 'path': str(flac_file)})['status'] == 'success'
+
+        pids = worker_pids(proc.pid)
+        assert pids
+        for pid in pids:
+            os.kill(pid, signal.SIGKILL)
+
+        # A request racing the crash may get an error, but it is answered
+        response = request({'id': 'r2', 'path': str(flac_file)})
+        assert response['id'] == 'r2'
+        assert response['status'] == 'success' or response['error'] == 'Worker process terminated'
+
+        response = request({'id': 'r3', 'path': str(flac_file), 'key': '5A'})
+        assert response == {'id': 'r3', 'status': 'success', 'key': '5A',
+                            'filename': 'test.flac', 'format': 'flac'}
+
+        proc.stdin.close()
+        assert proc.wait(timeout=60) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+@pytest.mark.parametrize('key', [None, '5A'])
+def test_missing_file_with_unsupported_extension(tmp_path, key):
+    """A missing file is reported as 'File not found' even if its extension isn't supported."""
+    request = {'id': 'r', 'path': str(tmp_path / 'missing.xyz')}
+    if key:
+        request['key'] = key
+
+    assert process_request(request) == {'id': 'r', 'status': 'error', 'error': 'File not found',
+                                        'filename': 'missing.xyz'}
+
+
+def test_unsupported_extension(tmp_path):
+    """An existing file with an unsupported extension is reported as such."""
+    path = tmp_path / 'notes.xyz'
+    path.write_bytes(b'not audio')
+
+    response = process_request({'id': 'r', 'path': str(path), 'key': '5A'})
+    assert response['error'] == 'Unsupported file format: .xyz'
+
+
+def test_read_sees_rewrite_with_same_size_and_mtime(flac_file):
+    """
+    A read request sees a change made by another process since the last
+    request, even when that change kept the file's size and mtime (a same-length
+    key written within one tick of a coarse-timestamp filesystem).
+    """
+    path = str(flac_file)
+    assert process_request({'id': 'w', 'path': path, 'key': '9A'})['status'] == 'success'
+    assert process_request({'id': 'r1', 'path': path})['key'] == '9A'
+
+    # Another program rewrites the key in place, then the old mtime is restored
+    before = os.stat(path)
+    audio = FLAC(path)
+    audio['initialkey'] = '8A'
+    audio.save()
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    after = os.stat(path)
+    assert (after.st_size, after.st_mtime_ns) == (before.st_size, before.st_mtime_ns)
+
+    assert process_request({'id': 'r2', 'path': path})['key'] == '8A'
+
+
+if __name__ == '__main__':
+    test_files_dir = sys.argv[1] if len(sys.argv) > 1 else './test-files'
+    sys.exit(pytest.main([__file__, '--test-files-dir', test_files_dir]))
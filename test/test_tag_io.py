@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Tests for the tagger's file-level read and write paths
+
+Covers the cases the round-trip suites don't reach with the stock test files:
+FLAC writes whose metadata outgrows the padding (whole-file rewrite), and the
+ID3v2 layouts the fast TKEY scanner hands over to mutagen.
+
+Run with pytest:
+    python3 -m pytest test_tag_io.py --test-files-dir ./test-files
+"""
+
+import sys
+import os
+import errno
+import zlib
+import shutil
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3
+
+if __name__ == '__main__':
+    # Run as a script: conftest.py (which puts the tagger on sys.path) isn't loaded yet
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import openkeyscan_tagger
+from openkeyscan_tagger import read_key_from_file, read_key_from_stream, write_key_to_file
+
+# Long enough that the Vorbis comment block can't fit in any stock padding
+BIG_KEY = 'Ab minor ' * 4000
+
+
+@pytest.fixture
+def flac_file(test_files_dir, tmp_path):
+    """Copy of test.flac, removed with tmp_path."""
+    src = Path(test_files_dir) / 'test.flac'
+    if not src.exists():
+        pytest.skip(f"test.flac not found in {test_files_dir}")
+    dst = tmp_path / 'test.flac'
+    shutil.copyfile(src, dst)
+    return dst
+
+
+@pytest.fixture
+def replace_calls(monkeypatch):
+    """Record the calls to _replace_file (the whole-file rewrite) made by the test."""
+    calls = []
+    replace_file = openkeyscan_tagger._replace_file
+
+    def spy(*args, **kwargs):
+        calls.append(args[0])
+        return replace_file(*args, **kwargs)
+
+    monkeypatch.setattr(openkeyscan_tagger, '_replace_file', spy)
+    return calls
+
+
+def audio_frames(path):
+    """Return the FLAC audio frames of path (everything after the metadata blocks)."""
+    with open(path, 'rb') as f:
+        offset = openkeyscan_tagger._find_flac_audio_offset(f)
+        assert offset is not None
+        f.seek(offset)
+        return f.read()
+
+
+def assert_written(path, frames, key_value):
+    """The file holds key_value and the same audio frames as before the write."""
+    success, read_key, *_ = read_key_from_file(path)
+    assert success
+    assert read_key == key_value
+    assert audio_frames(path) == frames
+    FLAC(path)  # still parses as a whole
+
+
+def test_flac_growing_metadata_rewrites_file(flac_file, replace_calls):
+    """Metadata that outgrows the padding is written by rewriting the file; audio survives."""
+    frames = audio_frames(flac_file)
+
+    assert write_key_to_file(flac_file, BIG_KEY) == (True, None, 'flac')
+
+    if not hasattr(os, 'listxattr'):
+        # No way to carry extended attributes over here, so it's saved in place
+        assert replace_calls == []
+    else:
+        assert len(replace_calls) == 1
+    assert_written(flac_file, frames, BIG_KEY)
+
+
+def test_flac_rewrite_keeps_hardlinks(flac_file, replace_calls):
+    """A hardlinked file is saved in place, so every link sees the new key."""
+    frames = audio_frames(flac_file)
+    link = flac_file.with_name('link.flac')
+    os.link(flac_file, link)
+
+    assert write_key_to_file(flac_file, BIG_KEY) == (True, None, 'flac')
+
+    assert replace_calls == []
+    assert os.stat(flac_file).st_nlink == 2
+    assert os.path.samefile(flac_file, link)
+    assert_written(link, frames, BIG_KEY)
+
+
+def test_flac_rewrite_falls_back_in_place(flac_file, monkeypatch):
+    """If the sibling temp file can't be created (e.g. read-only directory), the write still succeeds."""
+    frames = audio_frames(flac_file)
+
+    def mkstemp(*args, **kwargs):
+        raise PermissionError(errno.EACCES, 'Permission denied')
+
+    monkeypatch.setattr(openkeyscan_tagger.tempfile, 'mkstemp', mkstemp)
+
+    assert write_key_to_file(flac_file, BIG_KEY) == (True, None, 'flac')
+    assert_written(flac_file, frames, BIG_KEY)
+    assert [p.name for p in flac_file.parent.iterdir()] == ['test.flac']
+
+
+@pytest.mark.skipif(not hasattr(os, 'setxattr'), reason="no extended attribute support")
+def test_flac_rewrite_keeps_xattrs(flac_file, replace_calls):
+    """Extended attributes survive the whole-file rewrite."""
+    try:
+        os.setxattr(flac_file, 'user.openkeyscan-test', b'kept')
+    except OSError as e:
+        pytest.skip(f"filesystem rejects user xattrs: {e}")
+    frames = audio_frames(flac_file)
+
+    assert write_key_to_file(flac_file, BIG_KEY) == (True, None, 'flac')
+
+    assert len(replace_calls) == 1
+    assert os.getxattr(flac_file, 'user.openkeyscan-test') == b'kept'
+    assert_written(flac_file, frames, BIG_KEY)
+
+
+# ---------------------------------------------------------------------------
+# ID3v2 fast scan: layouts that must fall back to mutagen
+# ---------------------------------------------------------------------------
+
+# Stand-in for the MPEG audio after the tag; neither reader looks at it
+MPEG_AUDIO = b'\xff\xfb\x90\x00' + bytes(400)
+
+
+def synchsafe(n):
+    """Encode n as a 4-byte ID3v2 synchsafe integer."""
+    return bytes(((n >> 21) & 0x7f, (n >> 14) & 0x7f, (n >> 7) & 0x7f, n & 0x7f))
+
+
+def latin1_body(text):
+    """Text frame payload: ISO-8859-1 encoding byte plus the text."""
+    return b'\x00' + text.encode('latin-1')
+
+
+def frame_v23(frame_id, body, flags=0):
+    """ID3v2.3 frame (plain 32-bit size)."""
+    return frame_id + len(body).to_bytes(4, 'big') + flags.to_bytes(2, 'big') + body
+
+
+def frame_v24(frame_id, body, flags=0, plain_size=False):
+    """ID3v2.4 frame (synchsafe size, or a plain 32-bit size as iTunes writes)."""
+    size = len(body).to_bytes(4, 'big') if plain_size else synchsafe(len(body))
+    return frame_id + size + flags.to_bytes(2, 'big') + body
+
+
+def id3_tag(version, data, flags=0):
+    """ID3v2 tag header for the given version and header flags, followed by data."""
+    return b'ID3' + bytes((version, 0, flags)) + synchsafe(len(data)) + data
+
+
+def id3v1_tag(title='', artist='', album=''):
+    """128-byte ID3v1 tag."""
+    def field(text):
+        return text.encode('latin-1')[:30].ljust(30, b'\x00')
+    return b'TAG' + field(title) + field(artist) + field(album) + b'2024' + bytes(30) + b'\xff'
+
+
+def unsynchronise(data):
+    """Apply ID3v2 unsynchronisation: a zero byte after every 0xFF."""
+    return data.replace(b'\xff', b'\xff\x00')
+
+
+def mutagen_fields(data):
+    """(key, artist, title, album) as mutagen reads them from the file bytes."""
+    tags = ID3(BytesIO(data))
+
+    def text(frame_id):
+        frame = tags.get(frame_id)
+        return str(frame.text[0]) if frame is not None and frame.text else None
+
+    return text('TKEY'), text('TPE1'), text('TIT2'), text('TALB')
+
+
+def _v22_frame(frame_id, text):
+    body = latin1_body(text)
+    return frame_id + len(body).to_bytes(3, 'big') + body
+
+
+def _v23_frames():
+    return (frame_v23(b'TKEY', latin1_body('9A')) + frame_v23(b'TPE1', latin1_body('Artist'))
+            + frame_v23(b'TIT2', latin1_body('Title \xff')) + frame_v23(b'TALB', latin1_body('Album')))
+
+
+def _v24_frames(key_frame=None):
+    key_frame = key_frame or frame_v24(b'TKEY', latin1_body('9A'))
+    return (key_frame + frame_v24(b'TPE1', latin1_body('Artist'))
+            + frame_v24(b'TIT2', latin1_body('Title')) + frame_v24(b'TALB', latin1_body('Album')))
+
+
+# Compressed (zlib) TKEY with the data length indicator mutagen requires for it
+_COMPRESSED_TKEY = synchsafe(len(latin1_body('9A'))) + zlib.compress(latin1_body('9A'))
+
+# name -> file bytes (tag + audio, optionally + ID3v1)
+ID3_FALLBACK_CASES = {
+    'v2.2': id3_tag(2, _v22_frame(b'TKE', '9A') + _v22_frame(b'TP1', 'Artist')
+                    + _v22_frame(b'TT2', 'Title') + _v22_frame(b'TAL', 'Album')) + MPEG_AUDIO,
+    'unsynchronisation': id3_tag(3, unsynchronise(_v23_frames()), flags=0x80) + MPEG_AUDIO,
+    # 6-byte v2.3 extended header: size, flags, padding size
+    'extended header': id3_tag(3, (6).to_bytes(4, 'big') + bytes(2) + bytes(4) + _v23_frames(),
+                               flags=0x40) + MPEG_AUDIO,
+    'compressed frame': id3_tag(4, _v24_frames(frame_v24(b'TKEY', _COMPRESSED_TKEY, flags=0x0009))) + MPEG_AUDIO,
+    # mutagen leaves the group byte in the payload, so the grouped frame is TALB rather than TKEY
+    'grouped frame': id3_tag(4, _v24_frames()[:-len(frame_v24(b'TALB', latin1_body('Album')))]
+                             + frame_v24(b'TALB', b'\x01' + latin1_body('Album'), flags=0x0040)) + MPEG_AUDIO,
+    # A frame of 200 bytes has its size's high bit set when written as a plain int
+    'iTunes plain-int sizes': id3_tag(4, frame_v24(b'TKEY', latin1_body('9A'), plain_size=True)
+                                      + frame_v24(b'TIT2', latin1_body('T' * 199), plain_size=True)) + MPEG_AUDIO,
+    # 256 as a plain int (00 00 01 00) is 128 as a synchsafe int, which lands in
+    # the zero-filled payload as if it were padding
+    'iTunes plain-int sizes, no high bit': id3_tag(4, frame_v24(b'PRIV', bytes(256), plain_size=True)
+                                                   + frame_v24(b'TKEY', latin1_body('9A'), plain_size=True)
+                                                   + frame_v24(b'TIT2', latin1_body('Title'), plain_size=True))
+                                           + MPEG_AUDIO,
+    # Zero frame ID followed by more frames: mutagen stops there too, but it isn't padding
+    'frames after zero frame ID': id3_tag(4, frame_v24(b'TIT2', latin1_body('Title')) + bytes(10)
+                                          + frame_v24(b'TKEY', latin1_body('9A'))) + MPEG_AUDIO,
+    'ID3v1 merge': id3_tag(4, frame_v24(b'TKEY', latin1_body('9A'))) + MPEG_AUDIO
+                   + id3v1_tag(title='V1 Title', artist='V1 Artist', album='V1 Album'),
+}
+
+
+@pytest.mark.parametrize('name', ID3_FALLBACK_CASES)
+def test_id3_fast_scan_falls_back_to_mutagen(name):
+    """The fast scanner declines the layout, and the reader's result equals mutagen's."""
+    data = ID3_FALLBACK_CASES[name]
+
+    assert openkeyscan_tagger._scan_id3_text_frames(BytesIO(data)) is None
+
+    success, key_value, fmt, error, artist, title, album = read_key_from_stream(BytesIO(data), '.mp3')
+    assert success, error
+    assert (key_value, artist, title, album) == mutagen_fields(data)
+    if name != 'frames after zero frame ID':
+        assert key_value == '9A'
+
+
+# name -> file bytes the fast scanner reads itself
+ID3_FAST_CASES = {
+    'v2.4': id3_tag(4, _v24_frames()) + MPEG_AUDIO,
+    'v2.3': id3_tag(3, frame_v23(b'TKEY', latin1_body('9A')) + frame_v23(b'TPE1', latin1_body('Artist'))
+                    + frame_v23(b'TIT2', latin1_body('Title')) + frame_v23(b'TALB', latin1_body('Album'))
+                    + bytes(100)) + MPEG_AUDIO,
+    # Synchsafe sizes of 128 and more (as cover art has), then padding
+    'v2.4 large frames': id3_tag(4, frame_v24(b'PRIV', bytes(256)) + _v24_frames()
+                                 + frame_v24(b'APIC', b'\x00image/jpeg\x00\x03\x00' + bytes(5000))
+                                 + bytes(1024)) + MPEG_AUDIO,
+}
+
+
+@pytest.mark.parametrize('name', ID3_FAST_CASES)
+def test_id3_fast_scan_common_layout(name):
+    """Common ID3v2.3/2.4 tags are read by the fast scanner, with the same result as mutagen."""
+    data = ID3_FAST_CASES[name]
+
+    assert openkeyscan_tagger._scan_id3_text_frames(BytesIO(data)) == mutagen_fields(data)
+    assert mutagen_fields(data) == ('9A', 'Artist', 'Title', 'Album')
+
+
+if __name__ == '__main__':
+    test_files_dir = sys.argv[1] if len(sys.argv) > 1 else './test-files'
+    sys.exit(pytest.main([__file__, '--test-files-dir', test_files_dir]))